@@ -15,7 +15,6 @@ autodoc_mock_imports = [
     "numpy", 
     "pandas", 
     "scipy", 
-    "librosa", 
     "torch", 
     "torchaudio",
     "demucs",
@@ -1,7 +1,6 @@
 import numpy as np
-import random
 import logging
-from typing import Optional, Dict, Union, Tuple
+from typing import Optional, Dict, Tuple
 
 from pedalboard import (
     Pedalboard, 
@@ -10,10 +9,8 @@ from pedalboard import (
     Distortion, 
     LowShelfFilter, 
     PeakFilter, 
-    HighShelfFilter,
     Chorus, 
-    Limiter,
-    Gain
+    Limiter
 )
 
 # 로깅 설정 (디버깅 용도)
@@ -39,6 +36,7 @@ class BassRack:
         # Section 1: Dynamics & Clean
         'gate_threshold_db': -55.0,
         'gate_ratio': 10.0,
+        'gate_release_ms': 100.0,
         'comp_threshold_db': -20.0,
         'comp_ratio': 4.0,
         'comp_attack_ms': 20.0,
@@ -59,9 +57,26 @@ class BassRack:
         
         # Section 4: Output
         'limiter_threshold_db': -0.5,
+        'limiter_release_ms': 100.0,
         'output_gain_db': 0.0
     }
 
+    # 랜덤화 범위 정의 (Min, Max) - Data Augmentation용
+    RANDOM_RANGES = {
+        'drive_db': (0.0, 15.0),
+        'comp_ratio': (3.0, 6.0),
+        'low_shelf_gain': (0.0, 4.0),
+        'mid_scoop_gain': (-6.0, -1.0),
+        'chorus_mix': (0.0, 0.4),
+        'chorus_depth': (0.1, 0.3),
+        'comp_threshold_db': (-25.0, -15.0),  # 미세 조정
+    }
+
+    # 이 값 이하의 설정은 사실상 항등 처리이므로 해당 스테이지를 체인에서 제외
+    GATE_MIN_THRESHOLD_DB = -90.0
+    EQ_MIN_GAIN_DB = 0.1
+    CHORUS_MIN_DEPTH = 0.01
+
     def __init__(self, preset: str = "default", verbose: bool = False):
         """
         BassRack 초기화
@@ -72,8 +87,15 @@ class BassRack:
             print(f"[BassRack] Initializing with preset: '{preset}'")
         self.current_settings = self.DEFAULT_CONFIG.copy()
         
+        # 랜덤화 범위를 배열로 미리 만들어 두고 한 번의 호출로 샘플링
+        self._rand_keys = list(self.RANDOM_RANGES)
+        self._rand_lows = np.array([lo for lo, _ in self.RANDOM_RANGES.values()])
+        self._rand_highs = np.array([hi for _, hi in self.RANDOM_RANGES.values()])
+        
         # 내부 Pedalboard 객체
         self.board: Optional[Pedalboard] = None
+        # 현재 board를 만든 설정값 (같은 설정이면 board 재생성 생략)
+        self._settings_key: Optional[Tuple] = None
         
         # 프리셋 적용 및 보드 빌드
         if preset != "default":
@@ -83,18 +105,25 @@ class BassRack:
 
     def _build_board(self) -> None:
         """
+        현재 설정값으로 Pedalboard 체인을 구성합니다.
+        설정이 마지막 빌드 때와 같으면 기존 board를 그대로 재사용합니다.
         """
+        key = tuple(sorted(self.current_settings.items()))
+        if self.board is not None and key == self._settings_key:
+            return
+
         s = self.current_settings
         effects_list = []
 
-        # 빈 구간 노이즈 정리.
-        effects_list.append(
-            NoiseGate(
-                threshold_db=s['gate_threshold_db'], 
-                ratio=s['gate_ratio'], 
-                release_ms=100
+        # 빈 구간 노이즈 정리. (-90dB 이하 임계값은 사실상 게이트가 열리지 않으므로 생략)
+        if s['gate_threshold_db'] > self.GATE_MIN_THRESHOLD_DB:
+            effects_list.append(
+                NoiseGate(
+                    threshold_db=s['gate_threshold_db'], 
+                    ratio=s['gate_ratio'], 
+                    release_ms=s['gate_release_ms']
+                )
             )
-        )
 
         # 펀치감을 만들고 다이내믹을 평탄화(README참고  )
         effects_list.append(
@@ -111,24 +140,27 @@ class BassRack:
             effects_list.append(Distortion(drive_db=s['drive_db']))
 
         # 베이스 톤 메이킹의 핵심
+        # EQ 게인이 0dB에 가까우면 항등 필터이므로 버퍼 순회를 한 번 줄이기 위해 생략
         #  (저음 보강)
-        effects_list.append(
-            LowShelfFilter(
-                cutoff_frequency_hz=s['low_shelf_freq'], 
-                gain_db=s['low_shelf_gain']
+        if abs(s['low_shelf_gain']) >= self.EQ_MIN_GAIN_DB:
+            effects_list.append(
+                LowShelfFilter(
+                    cutoff_frequency_hz=s['low_shelf_freq'], 
+                    gain_db=s['low_shelf_gain']
+                )
             )
-        )
         #(깔끔한 톤을 위해 중음역대 정리)
-        effects_list.append(
-            PeakFilter(
-                cutoff_frequency_hz=s['mid_scoop_freq'], 
-                gain_db=s['mid_scoop_gain'], 
-                q=s['mid_scoop_q']
+        if abs(s['mid_scoop_gain']) >= self.EQ_MIN_GAIN_DB:
+            effects_list.append(
+                PeakFilter(
+                    cutoff_frequency_hz=s['mid_scoop_freq'], 
+                    gain_db=s['mid_scoop_gain'], 
+                    q=s['mid_scoop_q']
+                )
             )
-        )
 
-        # 스테레오 이미지 확장 (옵션)
-        if s['chorus_mix'] > 0:
+        # 스테레오 이미지 확장 (옵션, depth가 거의 0이면 변조가 없으므로 생략)
+        if s['chorus_mix'] > 0 and s['chorus_depth'] > self.CHORUS_MIN_DEPTH:
             effects_list.append(
                 Chorus(
                     rate_hz=s['chorus_rate_hz'], 
@@ -141,36 +173,57 @@ class BassRack:
         effects_list.append(
             Limiter(
                 threshold_db=s['limiter_threshold_db'], 
-                release_ms=100
+                release_ms=s['limiter_release_ms']
             )
         )
         
         #객체 생성
         self.board = Pedalboard(effects_list)
+        self._settings_key = key
         
         if self.verbose:
             print("[BassRack] Effect chain rebuilt successfully.")
 
-    def process(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    def process(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        reset: bool = True,
+        channels_first: Optional[bool] = None
+    ) -> np.ndarray:
+        """
+        오디오에 이펙트 체인 적용
         
+        Args:
+            audio: 입력 오디오 [channels, samples], [samples, channels] 또는 [samples]
+            sample_rate: 샘플링 레이트
+            reset: 처리 전에 이펙트 내부 상태를 리셋할지 여부
+                (스트리밍 처리 시 이어지는 청크는 False로 호출)
+            channels_first: 2차원 입력의 레이아웃. True면 [channels, samples], False면
+                [samples, channels]. None이면 shape으로 추측함 (채널 수보다 짧은 청크는 잘못
+                판단하므로 스트리밍처럼 레이아웃을 아는 경우 명시할 것)
+        """
         # 방어 코드
         if self.board is None:
             self._build_board()
 
-        input_audio = audio.copy()
-        
-        
-        if input_audio.ndim == 1:
-            input_audio = input_audio[np.newaxis, :]
+        if audio.ndim == 1:
+            audio = audio[np.newaxis, :]
+
+        # Pedalboard 내부 버퍼는 (C, T) 레이아웃이므로 (T, C) 입력일 때만 전치
+        if channels_first is None:
+            channels_first = audio.shape[0] <= audio.shape[1]
+        transposed = not channels_first
+        if transposed:
+            audio = audio.T
 
-        transposed = False
-        if input_audio.shape[0] > input_audio.shape[1]:
-            input_audio = input_audio.T
-            transposed = True
+        # Pedalboard는 입력을 수정하지 않으므로 방어적 복사 불필요.
+        # 이미 float32 연속 배열이면 그대로 사용하고, 아니면 여기서 한 번만 변환
+        input_audio = np.ascontiguousarray(audio, dtype=np.float32)
 
-        processed_audio = self.board(input_audio, sample_rate)
+        processed_audio = self.board(input_audio, sample_rate, reset=reset)
 
-        # 복구
+        # 복구 (view라서 추가 복사 없음)
         if transposed:
             processed_audio = processed_audio.T
 
@@ -219,27 +272,10 @@ class BassRack:
 
     def randomize_parameters(self, seed: Optional[int] = None) -> 'BassRack':
         
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-            
-        # 랜덤화 범위 정의 (Min, Max)
-        ranges = {
-            'drive_db': (0.0, 15.0),
-            'comp_ratio': (3.0, 6.0),
-            'low_shelf_gain': (0.0, 4.0),
-            'mid_scoop_gain': (-6.0, -1.0),
-            'chorus_mix': (0.0, 0.4),
-            'chorus_depth': (0.1, 0.3)
-        }
-        
-        # 랜덤 값 생성 및 적용
-        random_updates = {}
-        for key, (min_val, max_val) in ranges.items():
-            random_updates[key] = random.uniform(min_val, max_val)
-            
-        # 미세 조정
-        random_updates['comp_threshold_db'] = random.uniform(-25.0, -15.0)
+        # 전역 난수 상태를 건드리지 않는 독립 PCG64 스트림 (같은 seed -> 같은 결과)
+        rng = np.random.default_rng(seed)
+        values = rng.uniform(self._rand_lows, self._rand_highs)
+        random_updates = dict(zip(self._rand_keys, values.tolist()))
 
         if self.verbose:
             print("[BassRack] Applying random parameters for augmentation...")
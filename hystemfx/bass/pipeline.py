@@ -6,12 +6,17 @@ Bass Processing Pipeline
 설정된 이펙트 체인을 적용하여 최종 결과물을 생성하는 파이프라인을 제공합니다.
 """
 
+import os
+import threading
 import numpy as np
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, Union, Dict
 from pathlib import Path
 
 from .separator import BassSeparator, separate_bass
 from .effects import BassRack
+from hystemfx.core.io import readahead
 
 class BassPipeline:
     """
@@ -31,6 +36,9 @@ class BassPipeline:
         separation_model: str = "htdemucs_6s",
         device: Optional[str] = None,
         effect_preset: str = "default",
+        segment: Optional[float] = None,
+        overlap: float = 1.0,
+        compile_model: bool = False,
         **effect_params
     ):
         """
@@ -39,12 +47,28 @@ class BassPipeline:
         :param separation_model: 사용할 Demucs 모델 이름 (기본값: "htdemucs_6s")
         :param device: 연산에 사용할 디바이스 ('cuda', 'cpu' 또는 None). None일 경우 자동 선택됨.
         :param effect_preset: 적용할 이펙트 프리셋 이름 (예: "default", "vintage", "modern")
+        :param segment: `process_file`에서 한 번에 분리할 길이(초). 지정 시 파일을 segment 단위로 스트리밍 처리하여
+            메모리 사용량을 곡 길이와 무관하게 유지함. None이면 파일 전체를 한 번에 처리함.
+        :param overlap: 스트리밍 처리 시 segment 앞뒤로 함께 분리하는 문맥 길이(초)
+        :param compile_model: True일 경우 CUDA에서 torch.compile로 분리 모델을 컴파일함 (여러 파일을 처리하는 배치 작업에 유리)
         :param effect_params: 이펙트 체인에 전달할 추가 파라미터들
         """
-        self.separator = BassSeparator(model_name=separation_model, device=device)
+        self.separator = BassSeparator(
+            model_name=separation_model, device=device, compile_model=compile_model
+        )
         self.effect_preset = effect_preset
         self.effect_params = effect_params
+        self.segment = segment
+        self.overlap = overlap
         self.fx_rack = BassRack(preset=effect_preset)
+        # fx_rack에 마지막으로 로드된 프리셋 (None이면 랜덤화 등으로 설정이 바뀐 상태)
+        self._loaded_preset: Optional[str] = effect_preset
+    
+    def _load_effect_preset(self) -> None:
+        """effect_preset이 바뀌었거나 설정이 변경된 경우에만 프리셋을 다시 로드함."""
+        if self._loaded_preset != self.effect_preset:
+            self.fx_rack.load_preset(self.effect_preset)
+            self._loaded_preset = self.effect_preset
         
     def process(
         self,
@@ -70,6 +94,9 @@ class BassPipeline:
         """
         print("Step 1/2: Separating bass from mix...")
         
+        # 분리/이펙트 체인 전체를 float32로 통일 (soundfile 기본값인 float64 입력도 여기서 한 번만 변환)
+        audio = np.asarray(audio, dtype=np.float32)
+        
         # 음원 분리
         if return_all_stems:
             stems = self.separator.separate(audio, sample_rate, return_all_stems=True)
@@ -80,8 +107,8 @@ class BassPipeline:
         # 이펙트 적용
         if apply_effects:
             print("Step 2/2: Applying effects chain...")
-            # BassRack uses load_preset and process method
-            self.fx_rack.load_preset(self.effect_preset)
+            # 프리셋이 바뀐 경우에만 다시 로드 (매 호출마다 보드 재생성 방지)
+            self._load_effect_preset()
             # BassRack.process takes (audio, sample_rate)
             processed = self.fx_rack.process(bass_audio, sample_rate)
             
@@ -101,7 +128,8 @@ class BassPipeline:
         input_path: Union[str, Path],
         output_path: Optional[Union[str, Path]] = None,
         apply_effects: bool = True,
-        save_separated_only: bool = False
+        save_separated_only: bool = False,
+        segment: Optional[float] = None
     ) -> Optional[np.ndarray]:
         """
         오디오 파일을 읽어서 분리 및 이펙트 처리를 수행하고, 결과를 파일로 저장함.
@@ -110,8 +138,10 @@ class BassPipeline:
         :param output_path: 처리된 오디오를 저장할 경로 (None일 경우 저장하지 않음)
         :param apply_effects: 이펙트 적용 여부 (기본값: True)
         :param save_separated_only: True일 경우 이펙트 처리 없이 분리된 원본(Clean) 스템만 저장함.
+        :param segment: 이 호출에서만 사용할 스트리밍 segment 길이(초). None이면 인스턴스의 `segment` 설정을 따름.
         
-        :return: 처리된 오디오 데이터 (NumPy 배열)
+        :return: 처리된 오디오 데이터 (NumPy 배열). `segment`가 지정된 스트리밍 모드에서
+            `output_path`가 주어지면 결과를 메모리에 모으지 않으므로 None을 반환함.
         :raises ImportError: pedalboard 라이브러리가 설치되지 않은 경우 발생
         """
         try:
@@ -122,7 +152,16 @@ class BassPipeline:
                 "pip install pedalboard"
             )
         
-        # 오디오 파일 로드
+        segment = segment if segment is not None else self.segment
+        if segment is not None:
+            return self._process_file_streaming(
+                input_path,
+                output_path,
+                apply_effects=apply_effects and not save_separated_only,
+                segment=segment
+            )
+        
+        # 오디오 파일 로드 (AudioFile.read는 항상 float32를 반환하므로 추가 변환 없음)
         print(f"Loading audio from: {input_path}")
         with AudioFile(str(input_path)) as f:
             audio = f.read(f.frames)
@@ -147,61 +186,221 @@ class BassPipeline:
         
         return processed
     
+    def _process_file_streaming(
+        self,
+        input_path: Union[str, Path],
+        output_path: Optional[Union[str, Path]],
+        apply_effects: bool,
+        segment: float,
+        rack: Optional[BassRack] = None
+    ) -> Optional[np.ndarray]:
+        """
+        파일을 `segment` 단위로 읽고 분리/이펙트 처리한 뒤 곧바로 출력 파일에 기록함.
+        
+        이펙트 체인은 첫 청크에서만 리셋하여 청크 경계에서도 컴프레서/코러스 상태가 이어지도록 함.
+        `rack`을 주면 파이프라인의 프리셋 대신 그 BassRack을 사용함 (배치의 파일별 랜덤 이펙트 등).
+        """
+        from pedalboard.io import AudioFile
+        
+        print(f"Streaming audio from: {input_path} (segment={segment}s, overlap={self.overlap}s)")
+        sample_rate = self.separator.sample_rate
+        
+        if apply_effects and rack is None:
+            self._load_effect_preset()
+            rack = self.fx_rack
+        
+        out_file = None
+        chunks = []
+        try:
+            stream = self.separator.separate_stream(
+                input_path, segment=segment, overlap=self.overlap, keep=[self.separator.target_stem]
+            )
+            for i, stems in enumerate(stream):
+                bass_audio = stems[self.separator.target_stem]
+                
+                if apply_effects:
+                    bass_audio = rack.process(
+                        bass_audio, sample_rate, reset=(i == 0), channels_first=True
+                    )
+                
+                if output_path is None:
+                    chunks.append(bass_audio)
+                    continue
+                
+                if out_file is None:
+                    out_file = AudioFile(str(output_path), 'w', sample_rate, bass_audio.shape[0])
+                out_file.write(bass_audio)
+        finally:
+            if out_file is not None:
+                out_file.close()
+        
+        if output_path is not None:
+            print(f"Processed audio saved to: {output_path}")
+            return None
+        
+        return np.concatenate(chunks, axis=1)
+    
     def batch_process(
         self,
         input_files: list,
         output_dir: Union[str, Path],
         apply_effects: bool = True,
-        randomize_effects: bool = False
+        randomize_effects: bool = False,
+        num_workers: Optional[int] = None,
+        batch_size: int = 1,
+        prefetch: int = 2,
+        seed: Optional[int] = None
     ):
         """
         여러 오디오 파일을 일괄 처리(Batch Processing)함.
+        
+        분리(GPU)는 메인 스레드에서 순서대로 수행하고, 이펙트 적용과 저장(CPU)은 워커 스레드로 넘겨
+        다음 파일의 분리와 겹쳐서 실행함. Pedalboard는 처리 중 GIL을 해제하므로 스레드만으로 병렬화됨.
+        `batch_size`가 1보다 크면 여러 곡을 하나의 배치로 묶어 모델을 한 번에 실행함 (GPU 활용률 향상).
+        파이프라인에 `segment`가 설정되어 있으면 파일마다 segment 단위로 스트리밍 처리하며(메모리 사용량이
+        곡 길이와 무관), 이때 `batch_size`와 `prefetch`는 사용하지 않음. `randomize_effects`와 함께 쓰면
+        파일마다 랜덤 파라미터를 한 번 뽑은 랙으로 해당 파일 전체를 스트리밍 처리함.
 
         :param input_files: 입력 파일 경로들의 리스트
         :param output_dir: 결과 파일을 저장할 디렉토리 경로
         :param apply_effects: 이펙트 적용 여부
         :param randomize_effects: True일 경우 각 파일마다 랜덤한 이펙트 파라미터를 적용함 (데이터 증강 등에 활용 가능).
+        :param num_workers: 이펙트/저장 워커 스레드 수 (None이면 CPU 코어 수의 절반)
+        :param batch_size: 한 번의 분리 호출로 묶어 처리할 파일 수. 곡 길이가 비슷할수록 패딩 낭비가 적음.
+            묶인 곡들이 모두 메모리에 올라가므로 GPU에서 4~8 정도를 권장함 (CPU에서는 이득이 거의 없음).
+        :param prefetch: 분리 중에 미리 읽어(디코딩해) 둘 파일 수. 0이면 분리 직전에 순서대로 읽음.
+        :param seed: `randomize_effects` 사용 시 기준 시드. 지정하면 i번째 파일은 `seed + i`로 랜덤화되어
+            같은 입력 목록에 대해 항상 같은 결과를 냄 (None이면 매번 다른 랜덤 파라미터).
         """
+        try:
+            from pedalboard.io import AudioFile
+        except ImportError:
+            raise ImportError("Pedalboard is not installed.")
+        
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        for i, input_file in enumerate(input_files):
-            input_path = Path(input_file)
-            output_path = output_dir / f"{input_path.stem}_bass_processed{input_path.suffix}"
-            
-            print(f"\n[{i+1}/{len(input_files)}] Processing: {input_path.name}")
+        num_workers = num_workers or max(1, (os.cpu_count() or 2) // 2)
+        
+        # Pedalboard 플러그인 상태는 스레드 간 공유할 수 없으므로 워커마다 BassRack을 따로 둠
+        local = threading.local()
+        
+        def finish(bass_audio: np.ndarray, sample_rate: int, output_path: Path, index: int) -> None:
+            processed = bass_audio
+            if apply_effects:
+                # 프리셋 보드는 워커당 한 번만 만들고 이후 파일에서는 그대로 재사용
+                rack = getattr(local, "rack", None)
+                if rack is None:
+                    rack = local.rack = BassRack(preset=self.effect_preset)
+                if randomize_effects:
+                    rack.randomize_parameters(seed=None if seed is None else seed + index)
+                processed = rack.process(bass_audio, sample_rate)
             
+            with AudioFile(str(output_path), 'w', sample_rate, processed.shape[0]) as f:
+                f.write(processed)
+        
+        def load(input_path: Path):
+            with AudioFile(str(input_path)) as f:
+                return f.read(f.frames), f.samplerate
+        
+        def report(input_path: Path, output_path: Path, future: Future) -> None:
             try:
-                if randomize_effects and apply_effects:
-                    # 랜덤 이펙트 사용 (BassRack supports randomize_parameters)
-                    try:
-                        from pedalboard.io import AudioFile
-                    except ImportError:
-                        raise ImportError("Pedalboard is not installed.")
-                    
-                    with AudioFile(str(input_path)) as f:
-                        audio = f.read(f.frames)
-                        sample_rate = f.samplerate
-                    
-                    # 분리
-                    bass_audio = self.separator.separate(audio, sample_rate)
-                    
-                    # 랜덤 이펙트 적용
-                    self.fx_rack.randomize_parameters() # seed?
-                    processed = self.fx_rack.process(bass_audio, sample_rate)
-                    print(f"  Applied randomized effects.")
-                    
-                    # 저장
-                    with AudioFile(str(output_path), 'w', sample_rate, processed.shape[0]) as f:
-                        f.write(processed)
-                else:
-                    # 일반 처리
-                    self.process_file(input_path, output_path, apply_effects=apply_effects)
-                    
+                future.result()
                 print(f"  ✓ Saved to: {output_path}")
-                
             except Exception as e:
                 print(f"  ✗ Error processing {input_path.name}: {e}")
+        
+        # 분리된 스템이 메모리에 쌓이지 않도록 대기 중인 작업 수를 제한
+        max_pending = 2 * num_workers
+        pending = deque()
+        
+        def separate_group(group: list) -> None:
+            """읽어 둔 파일들을 한 번에 분리하고 이펙트/저장 작업을 워커에 넘김."""
+            try:
+                # 분리 (GPU)
+                # 베이스 스템만 CPU로 가져옴
+                keep = [self.separator.target_stem]
+                if len(group) == 1:
+                    stems_list = [self.separator.separate_memory(group[0][3], keep=keep)]
+                else:
+                    stems_list = self.separator.separate_batch([audio for _, _, _, audio, _ in group], keep=keep)
+            except Exception as e:
+                for _, input_path, _, _, _ in group:
+                    print(f"  ✗ Error processing {input_path.name}: {e}")
+                return
+            
+            for (index, input_path, output_path, _, sample_rate), stems in zip(group, stems_list):
+                # 이펙트 + 저장 (CPU, 다음 파일 분리와 병렬 진행)
+                bass_audio = stems[self.separator.target_stem]
+                future = executor.submit(finish, bass_audio, sample_rate, output_path, index)
+                pending.append((input_path, output_path, future))
+        
+        # 스트리밍 모드는 process_file이 segment 단위로 직접 읽으므로 미리 읽지 않음
+        streaming = self.segment is not None
+        # 스트리밍은 메인 스레드에서 파일 단위로 진행되므로 랜덤 랙 하나를 파일마다 다시 랜덤화하여 사용
+        stream_rack = BassRack(preset=self.effect_preset) if streaming and randomize_effects else None
+        input_paths = [Path(input_file) for input_file in input_files]
+        loads = deque()
+        window = max(0, prefetch)
+        
+        def schedule_load(j: int) -> None:
+            if window and not streaming and j < len(input_paths):
+                loads.append(reader.submit(load, input_paths[j]))
+                # 그 다음 윈도우의 파일은 디스크 읽기만 커널에 미리 맡겨 둠 (디코딩 중 I/O 지연 숨김)
+                if j + window < len(input_paths):
+                    readahead(input_paths[j + window])
+        
+        # 분리 모델은 __init__에서 한 번만 로드되어 self.separator에 상주하므로
+        # 루프 안에서는 재사용만 함 (파일마다 모델을 다시 로드하지 않음)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor, \
+                ThreadPoolExecutor(max_workers=max(1, window)) as reader:
+            # 디코딩(I/O)을 분리(GPU)와 겹치도록 다음 파일들을 미리 읽기 시작
+            for j in range(window):
+                schedule_load(j)
+            
+            group = []
+            for i, input_path in enumerate(input_paths):
+                output_path = output_dir / f"{input_path.stem}_bass_processed{input_path.suffix}"
+                
+                print(f"\n[{i+1}/{len(input_files)}] Processing: {input_path.name}")
+                
+                try:
+                    if streaming:
+                        # 스트리밍 모드는 이미 메모리 사용량이 segment 단위로 제한되므로 그대로 처리
+                        if stream_rack is not None and apply_effects:
+                            stream_rack.randomize_parameters(seed=None if seed is None else seed + i)
+                            self._process_file_streaming(
+                                input_path, output_path, apply_effects=True,
+                                segment=self.segment, rack=stream_rack
+                            )
+                        else:
+                            self.process_file(input_path, output_path, apply_effects=apply_effects)
+                        print(f"  ✓ Saved to: {output_path}")
+                        continue
+                    
+                    if window:
+                        load_future = loads.popleft()
+                        schedule_load(i + window)
+                        audio, sample_rate = load_future.result()
+                    else:
+                        audio, sample_rate = load(input_path)
+                    group.append((i, input_path, output_path, audio, sample_rate))
+                    
+                except Exception as e:
+                    print(f"  ✗ Error processing {input_path.name}: {e}")
+                
+                if len(group) >= batch_size:
+                    separate_group(group)
+                    group = []
+                
+                while len(pending) >= max_pending:
+                    report(*pending.popleft())
+            
+            if group:
+                separate_group(group)
+            
+            while pending:
+                report(*pending.popleft())
 
 
 def process_bass_from_mix(
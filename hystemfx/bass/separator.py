@@ -13,15 +13,21 @@ class BassSeparator(DemucsSeparator):
     DemucsSeparator를 상속받아 'bass' 스템을 추출함.
     """
     
-    def __init__(self, model_name: str = "htdemucs_6s", device: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: str = "htdemucs_6s",
+        device: Optional[str] = None,
+        compile_model: bool = False
+    ):
         """
         초기화함.
         
         Parameters:
             model_name (str): 사용할 Demucs 모델 이름 (기본값: "htdemucs_6s")
             device (str): 실행 디바이스 ('cuda', 'cpu' 등)
+            compile_model (bool): True일 경우 CUDA에서 torch.compile로 모델을 컴파일함 (배치 처리용)
         """
-        super().__init__(device=device)
+        super().__init__(device=device, compile_model=compile_model, model_name=model_name)
         self.target_stem = "bass"
 
     def separate(
@@ -42,7 +48,11 @@ class BassSeparator(DemucsSeparator):
             np.ndarray: 분리된 베이스 오디오 (return_all_stems=False)
             Dict[str, np.ndarray]: 모든 스템 (return_all_stems=True)
         """
-        stems = self.separate_memory(audio)
+        # 대상 스템(없으면 fallback용 'other')만 CPU로 복사하고 나머지는 버림
+        keep = None
+        if not return_all_stems:
+            keep = [self.target_stem if self.target_stem in self.model.sources else "other"]
+        stems = self.separate_memory(audio, keep=keep)
         
         if return_all_stems:
             return stems
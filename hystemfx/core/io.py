@@ -6,20 +6,61 @@ Standard settings:
 - Channels: Stereo (2 channels) by default
 - Normalization: False by default (can be enabled at processing stages)
 - Format: WAV (default), with support for other formats via soundfile
+- Layout: (channels, samples), C-contiguous float32 -- the layout Demucs and
+  Pedalboard use internally, so arrays pass between stages without transposes.
+  ``load_audio`` returns it and ``save_audio`` expects it.
 """
 
+import os
 import numpy as np
 import soundfile as sf
+from math import gcd
 from pathlib import Path
 from typing import Tuple, Optional, Union
 
+from scipy.signal import resample_poly
+
 # Global configuration
 DEFAULT_SAMPLE_RATE = 44100  # Standard CD quality sample rate
+WRITE_BLOCK_FRAMES = 1 << 16  # Frames per write call in save_audio (keeps the interleave buffer cache-sized)
+
+
+def _read_audio(path: Path, dtype: str) -> Tuple[np.ndarray, int]:
+    """
+    Decode an audio file at its native sample rate.
+    
+    soundfile is tried first; formats libsndfile cannot decode (e.g. some MP3s)
+    fall back to ``pedalboard.io.AudioFile``.
+    
+    :return: Tuple of (audio_data, sample_rate), audio_data shaped (channels, samples)
+    """
+    try:
+        audio, original_sr = sf.read(str(path), dtype=dtype, always_2d=True)
+        # libsndfile decodes interleaved (samples, channels); de-interleave once here
+        return np.ascontiguousarray(audio.T), original_sr
+    except RuntimeError:
+        from pedalboard.io import AudioFile
+        
+        with AudioFile(str(path)) as f:
+            audio = f.read(f.frames)
+            original_sr = int(f.samplerate)
+        
+        # pedalboard already returns (channels, samples)
+        return audio.astype(dtype, copy=False), original_sr
+
+
+def _peak(audio: np.ndarray) -> float:
+    """
+    Absolute peak of the signal without allocating an ``np.abs`` temporary.
+    
+    :return: ``max(|audio|)`` computed as ``max(max(audio), -min(audio))``
+    """
+    return float(max(audio.max(), -audio.min()))
 
 
 def load_audio(
     path: Union[str, Path],
-    sr: int = DEFAULT_SAMPLE_RATE,
+    sr: Optional[int] = DEFAULT_SAMPLE_RATE,
     mono: bool = False,
     normalize: bool = False,
     dtype: str = 'float32'
@@ -29,8 +70,9 @@ def load_audio(
     
     :param path: Path to the audio file
     :type path: str or Path
-    :param sr: Target sample rate (default: 44100 Hz)
-    :type sr: int
+    :param sr: Target sample rate (default: 44100 Hz). ``None`` keeps the file's native rate
+        (useful when resampling is done later, e.g. on the GPU)
+    :type sr: int or None
     :param mono: Convert to mono if True, keep stereo if False (default: False)
     :type mono: bool
     :param normalize: Normalize audio to [-1, 1] range if True (default: False)
@@ -38,8 +80,8 @@ def load_audio(
     :param dtype: Data type for the audio array (default: 'float32')
     :type dtype: str
     :return: Tuple of (audio_data, sample_rate)
-        - audio_data: numpy array of shape (samples,) for mono or (samples, channels) for stereo
-        - sample_rate: sample rate of the audio
+        - audio_data: C-contiguous numpy array of shape (samples,) if ``mono`` else (channels, samples)
+        - sample_rate: sample rate of the returned audio
     :rtype: Tuple[np.ndarray, int]
     
     :raises FileNotFoundError: If the audio file does not exist
@@ -48,7 +90,7 @@ def load_audio(
     Example:
         >>> audio, sr = load_audio('input.wav')
         >>> print(f"Shape: {audio.shape}, Sample Rate: {sr}")
-        Shape: (220500, 2), Sample Rate: 44100
+        Shape: (2, 220500), Sample Rate: 44100
         
         >>> # Load as mono
         >>> audio_mono, sr = load_audio('input.wav', mono=True)
@@ -62,22 +104,35 @@ def load_audio(
     
     try:
         # Load audio file
-        audio, original_sr = sf.read(str(path), dtype=dtype)
+        audio, original_sr = _read_audio(path, dtype)
+        
+        if sr is None:
+            sr = original_sr
         
-        # Resample if necessary
+        # Resample if necessary (one-shot polyphase, no intermediate copy)
         if original_sr != sr:
-            import librosa
-            audio = librosa.resample(audio.T, orig_sr=original_sr, target_sr=sr).T
+            g = gcd(int(original_sr), int(sr))
+            audio = resample_poly(audio, sr // g, original_sr // g, axis=-1)
+            audio = audio.astype(dtype, copy=False)
         
         # Convert to mono if requested (processor stage can also do this)
-        if mono and audio.ndim > 1:
-            audio = np.mean(audio, axis=1)
+        if mono:
+            if audio.shape[0] == 2 and np.issubdtype(audio.dtype, np.floating):
+                # Stereo: one add into a fresh row + in-place halve, no dtype widening
+                mono_audio = np.add(audio[0], audio[1])
+                mono_audio *= 0.5
+                audio = mono_audio
+            else:
+                audio = np.mean(audio, axis=0)
         
-        # Normalize if requested
+        # Normalize if requested (the decoded buffer is ours, so scale in place)
         if normalize:
-            max_val = np.abs(audio).max()
+            max_val = _peak(audio)
             if max_val > 0:
-                audio = audio / max_val
+                if np.issubdtype(audio.dtype, np.floating):
+                    audio *= 1.0 / max_val
+                else:
+                    audio = audio / max_val
         
         return audio, sr
         
@@ -96,7 +151,7 @@ def save_audio(
     """
     Save audio file with standardized settings.
     
-    :param audio: Audio data to save (shape: (samples,) for mono or (samples, channels) for stereo)
+    :param audio: Audio data to save (shape: (samples,) for mono or (channels, samples))
     :type audio: np.ndarray
     :param path: Target path to save the audio file
     :type path: str or Path
@@ -115,7 +170,7 @@ def save_audio(
     :raises RuntimeError: If there's an error writing the audio file
     
     Example:
-        >>> audio = np.random.randn(44100, 2)  # 1 second of stereo audio
+        >>> audio = np.random.randn(2, 44100)  # 1 second of stereo audio
         >>> save_audio(audio, 'output/result.wav')
         
         >>> # Save with normalization
@@ -137,20 +192,152 @@ def save_audio(
     if audio.size == 0:
         raise ValueError("Audio data is empty")
     
-    # Normalize if requested
+    # Normalize if requested (the caller's array is left untouched)
     if normalize:
-        max_val = np.abs(audio).max()
+        max_val = _peak(audio)
         if max_val > 0:
-            audio = audio / max_val
+            audio = audio * (1.0 / max_val)
     
     try:
-        # Save audio file
-        sf.write(str(path), audio, sr, subtype=subtype)
+        audio = audio[np.newaxis, :] if audio.ndim == 1 else audio
+        with sf.SoundFile(str(path), 'w', sr, audio.shape[0], subtype=subtype) as f:
+            _write_blocks(f, audio, subtype)
         
     except Exception as e:
         raise RuntimeError(f"Error saving audio file {path}: {str(e)}")
 
 
+def _write_blocks(f: sf.SoundFile, audio: np.ndarray, subtype: str) -> None:
+    """
+    Write a (channels, frames) array to an open SoundFile block by block.
+    
+    Blocks keep libsndfile from converting the whole signal into one full-length
+    buffer at once. soundfile wants interleaved (frames, channels) data, so each
+    (channels, frames) block is transposed here -- only a block-sized copy, never
+    a full-length one.
+    """
+    channels, frames = audio.shape
+    # 16-bit output from float input: quantize each block with vectorized NumPy
+    # into reused buffers and hand libsndfile int16 directly instead of letting
+    # it convert sample by sample. libsndfile rounds to 32-bit first and keeps
+    # the top 16 bits, so do the same (scale by 2**31, round, floor the /65536,
+    # saturate) to stay bit-identical. Other subtypes pass as-is.
+    to_pcm16 = subtype == 'PCM_16' and np.issubdtype(audio.dtype, np.floating)
+    if to_pcm16:
+        # float64 input is quantized in float64, as libsndfile does for doubles
+        work_dtype = np.result_type(audio.dtype, np.float32)
+        scratch = np.empty((min(frames, WRITE_BLOCK_FRAMES), channels), dtype=work_dtype)
+        pcm = np.empty(scratch.shape, dtype=np.int16)
+    for start in range(0, frames, WRITE_BLOCK_FRAMES):
+        block = audio[:, start:start + WRITE_BLOCK_FRAMES].T
+        if to_pcm16:
+            n = block.shape[0]
+            tmp = scratch[:n]
+            np.multiply(block, 2147483648.0, out=tmp)
+            np.rint(tmp, out=tmp)
+            tmp *= 1.0 / 65536.0
+            np.floor(tmp, out=tmp)
+            np.clip(tmp, -32768.0, 32767.0, out=tmp)
+            np.copyto(pcm[:n], tmp, casting='unsafe')
+            block = pcm[:n]
+        f.write(block)
+
+
+class AudioWriter:
+    """
+    Write an audio file incrementally, one (channels, samples) chunk at a time.
+    
+    For outputs produced segment by segment (streamed separation), so the full
+    signal never has to exist in memory. Chunks are converted exactly like
+    ``save_audio`` does, so writing a signal in pieces gives the same file as
+    saving it in one call.
+    
+    Example:
+        >>> with AudioWriter('output/long.wav', sr=44100, channels=2) as writer:
+        ...     for chunk in chunks:
+        ...         writer.write(chunk)
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        sr: int = DEFAULT_SAMPLE_RATE,
+        channels: int = 2,
+        subtype: str = 'PCM_16',
+        create_dirs: bool = True
+    ):
+        """
+        :param path: Target path to save the audio file
+        :type path: str or Path
+        :param sr: Sample rate (default: 44100 Hz)
+        :type sr: int
+        :param channels: Number of channels of every written chunk
+        :type channels: int
+        :param subtype: Audio format subtype (default: 'PCM_16' for 16-bit WAV)
+        :type subtype: str
+        :param create_dirs: Create parent directories if they don't exist (default: True)
+        :type create_dirs: bool
+        
+        :raises RuntimeError: If the file cannot be opened for writing
+        """
+        self.path = Path(path)
+        self.subtype = subtype
+        if create_dirs:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._file = sf.SoundFile(str(self.path), 'w', sr, channels, subtype=subtype)
+        except Exception as e:
+            raise RuntimeError(f"Error saving audio file {self.path}: {str(e)}")
+    
+    def write(self, audio: np.ndarray) -> None:
+        """
+        Append a chunk shaped (samples,) for mono or (channels, samples).
+        
+        :raises RuntimeError: If there's an error writing the audio file
+        """
+        audio = audio[np.newaxis, :] if audio.ndim == 1 else audio
+        try:
+            _write_blocks(self._file, audio, self.subtype)
+        except Exception as e:
+            raise RuntimeError(f"Error saving audio file {self.path}: {str(e)}")
+    
+    def close(self) -> None:
+        self._file.close()
+    
+    def __enter__(self) -> "AudioWriter":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def readahead(path: Union[str, Path]) -> None:
+    """
+    Ask the kernel to start reading a whole file into the page cache.
+    
+    Uses ``posix_fadvise(WILLNEED)``: the call returns immediately and the disk
+    reads happen asynchronously, so a later ``load_audio`` / ``AudioFile`` decode
+    of the file does not wait on I/O. A no-op on platforms without
+    ``posix_fadvise`` or for files that cannot be opened.
+    
+    :param path: Path to the file that will be read soon
+    :type path: str or Path
+    :return: None
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def get_audio_info(path: Union[str, Path]) -> dict:
     """
     Get information about an audio file without loading the full data.
@@ -1,73 +1,527 @@
+import julius
 import torch
 import numpy as np
+from contextlib import nullcontext
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 from demucs import pretrained
-from demucs.apply import apply_model
+from demucs.apply import BagOfModels, TensorChunk, apply_model
+from demucs.htdemucs import HTDemucs
+from demucs.utils import center_trim
 
 from .io import load_audio 
 
+# GPU 메모리가 이보다 작으면 segment를 줄여 OOM을 피함
+SMALL_GPU_MEMORY_GB = 6
+SMALL_GPU_SEGMENT = 7.0
+
+# precision 설정값 -> autocast dtype ("auto"는 장치에 따라 결정, "fp32"는 autocast 미사용)
+PRECISION_DTYPES = {
+    "auto": None,
+    "fp32": None,
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16,
+}
+
+# 기본 분리 모델 (guitar/piano까지 분리하는 6-stem 모델)
+DEFAULT_MODEL_NAME = "htdemucs_6s"
+
+# 로드된 Demucs 모델을 (model_name, device, compiled) 별로 프로세스 안에서 공유
+# (세션별 Separator/Pipeline을 여러 번 만들어도 가중치 로드와 장치 복사는 한 번만 수행)
+# compile_model은 모델의 forward를 교체하므로, 컴파일하지 않는 Separator와는 별도 인스턴스를 사용함
+_MODEL_CACHE: Dict[Tuple[str, str, bool], torch.nn.Module] = {}
+
+
+def _load_model(model_name: str, device: str, compiled: bool = False) -> torch.nn.Module:
+    """캐시된 모델을 반환하고, 없으면 로드 후 장치로 옮겨 캐시에 저장함."""
+    key = (model_name, device, compiled)
+    model = _MODEL_CACHE.get(key)
+    if model is None:
+        print(f"[Init] Loading Demucs model: {model_name} on {device}...")
+        model = pretrained.get_model(model_name)
+        model.to(device)
+        model.eval()
+        _MODEL_CACHE[key] = model
+    return model
+
+
+def _apply_model_batched(
+    model: torch.nn.Module,
+    mix: torch.Tensor,
+    segment: Optional[float],
+    overlap: float,
+    segment_batch: int
+) -> torch.Tensor:
+    """
+    apply_model(split=True, shifts=0)과 같은 결과를 내되, 겹치는 segment들을 `segment_batch`개씩
+    배치로 묶어 모델을 한 번에 실행함 (segment마다 forward를 따로 호출하는 대신 GPU를 채워서 사용).
+    
+    segment 자르기/패딩(TensorChunk), 삼각형 가중치 overlap-add, BagOfModels 가중 평균은
+    demucs.apply.apply_model과 동일하게 수행함.
+    
+    :param mix: (Batch, Channels, Time) 텐서 (모델 장치에 있음)
+    :return: (Batch, Sources, Channels, Time) float32 텐서
+    """
+    if isinstance(model, BagOfModels):
+        estimates = 0.
+        totals = [0.] * len(model.sources)
+        for sub_model, model_weights in zip(model.models, model.weights):
+            out = _apply_model_batched(sub_model, mix, segment, overlap, segment_batch)
+            for k, inst_weight in enumerate(model_weights):
+                out[:, k, :, :] *= inst_weight
+                totals[k] += inst_weight
+            estimates += out
+        for k in range(estimates.shape[1]):
+            estimates[:, k, :, :] /= totals[k]
+        return estimates
+
+    batch, channels, length = mix.shape
+    if segment is None:
+        segment = model.segment
+    segment_length = int(model.samplerate * segment)
+    stride = int((1 - overlap) * segment_length)
+    weight = torch.cat([
+        torch.arange(1, segment_length // 2 + 1, device=mix.device),
+        torch.arange(segment_length - segment_length // 2, 0, -1, device=mix.device),
+    ])
+    weight = weight / weight.max()
+
+    out = torch.zeros(batch, len(model.sources), channels, length, device=mix.device)
+    sum_weight = torch.zeros(length, device=mix.device)
+
+    def flush(pending: list) -> None:
+        # 같은 길이로 패딩된 segment들을 batch 축으로 이어 붙여 한 번에 실행
+        chunk_outs = model(torch.cat([padded for _, _, padded in pending])).split(batch)
+        for (offset, chunk_length, _), chunk_out in zip(pending, chunk_outs):
+            chunk_out = center_trim(chunk_out, chunk_length)
+            out[..., offset:offset + segment_length] += weight[:chunk_length] * chunk_out
+            sum_weight[offset:offset + segment_length] += weight[:chunk_length]
+
+    pending = []
+    for offset in range(0, length, stride):
+        chunk = TensorChunk(mix, offset, segment_length)
+        if isinstance(model, HTDemucs):
+            valid_length = segment_length
+        elif hasattr(model, "valid_length"):
+            valid_length = model.valid_length(chunk.length)
+        else:
+            valid_length = chunk.length
+        if pending and (len(pending) >= segment_batch or pending[-1][2].shape[-1] != valid_length):
+            flush(pending)
+            pending = []
+        pending.append((offset, chunk.length, chunk.padded(valid_length)))
+    if pending:
+        flush(pending)
+
+    out /= sum_weight
+    return out
+
+
+def default_device() -> str:
+    """
+    사용 가능한 가속 장치를 우선순위대로 선택함: CUDA(ROCm 빌드 포함) → Apple MPS → CPU
+    (ROCm 빌드의 PyTorch는 AMD GPU도 torch.cuda로 노출하므로 별도 분기가 필요 없음)
+    """
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return "cpu"
+
+
 class DemucsSeparator:
-    def __init__(self, device=None):
+    def __init__(
+        self,
+        device=None,
+        segment: Optional[float] = None,
+        overlap: float = 0.25,
+        compile_model: bool = False,
+        model_name: str = DEFAULT_MODEL_NAME,
+        precision: str = "auto",
+        segment_batch: int = 1
+    ):
         """
         Demucs 모델 초기화
-        :param device: cuda 또는 cpu (기본값: 자동 설정)
+        :param device: cuda, mps 또는 cpu (기본값: 자동 설정, `default_device` 참고)
+        :param segment: apply_model에 넘길 segment 길이(초). None이면 GPU 메모리에 맞춰 자동 선택
+            (segment가 길수록 분리는 빨라지지만 메모리를 더 사용함. HTDemucs는 학습 길이가 상한)
+        :param overlap: segment 간 겹침 비율 (기본값: 0.25)
+        :param compile_model: True이면 CUDA에서 torch.compile로 모델 forward를 컴파일함
+            (초기화 시 워밍업 비용이 들지만 여러 곡을 처리할 때 segment당 추론이 빨라짐).
+            컴파일된 모델은 컴파일하지 않는 Separator와 공유하지 않는 별도 사본임 (가중치 메모리를 한 번 더 씀).
+            segment_batch > 1이면 곡의 마지막 배치는 보통 segment 수가 적어 입력 shape가 달라지므로,
+            처음 나오는 배치 크기마다 그래프를 한 번씩 더 캡처함 (최대 segment_batch가지)
+        :param model_name: 사용할 Demucs pretrained 모델 이름 (기본값: "htdemucs_6s")
+        :param precision: 추론 정밀도 ("auto", "fp32", "fp16", "bf16").
+            "auto"는 CUDA에서 BF16(미지원 시 FP16), MPS에서 FP16, CPU에서 FP32를 사용함
+        :param segment_batch: 한 번의 forward로 묶어 실행할 segment 수 (기본값: 1 = demucs apply_model).
+            GPU에서 4 정도로 올리면 segment마다 커널을 따로 띄우는 오버헤드가 줄어듦
+            (VRAM은 segment_batch에 비례해 더 사용함. shifts > 0이면 apply_model을 그대로 사용)
         """
-        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
-        print(f"[Init] Loading Demucs model: htdemucs_6s on {self.device}...")
+        if precision not in PRECISION_DTYPES:
+            raise ValueError(f"precision must be one of {list(PRECISION_DTYPES)}, got '{precision}'")
+        self.precision = precision
+
+        self.device = device or default_device()
         
-        # Demucs Pretrained 모델 로드 (htdemucs_6s 고정)
-        self.model = pretrained.get_model("htdemucs_6s")
-        self.model.to(self.device)
+        # Demucs Pretrained 모델 로드 (이미 같은 장치에 로드된 모델은 재사용)
+        self.model_name = model_name
+        compile_model = compile_model and self.device.startswith("cuda") and hasattr(torch, "compile")
+        self.model = _load_model(model_name, self.device, compiled=compile_model)
         self.sample_rate = self.model.samplerate
+        
+        self.overlap = overlap
+        self.segment = self._resolve_segment(segment)
+        self.segment_batch = max(1, int(segment_batch))
+        
+        if self.device.startswith("cuda"):
+            # apply_model(split=True)은 모든 chunk를 모델 학습 길이로 패딩하므로 입력 shape가 항상 같음
+            # -> cuDNN 알고리즘 탐색은 첫 호출에서 한 번만 일어나고 이후 재사용됨
+            torch.backends.cudnn.benchmark = True
+            # precision="fp32"일 때도 Ampere 이상에서는 matmul/conv에 TF32 텐서 코어 사용
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+        
+        # CUDA 업로드용 pinned 스테이징 버퍼 (필요할 때 할당하고 더 긴 입력이 오면 키움)
+        self._pinned: Optional[torch.Tensor] = None
+        
+        if compile_model:
+            self._compile_model()
+
+    def _max_segment(self) -> Optional[float]:
+        """모델이 허용하는 최대 segment 길이(초). HTDemucs는 학습 길이보다 길게 줄 수 없음"""
+        models = getattr(self.model, "models", [self.model])
+        limits = [float(m.segment) for m in models if isinstance(m, HTDemucs)]
+        return min(limits) if limits else None
+
+    def _resolve_segment(self, segment: Optional[float]) -> Optional[float]:
+        """
+        사용할 segment 길이 결정
+        - 지정하지 않은 경우: 작은 GPU에서는 짧게, 그 외에는 모델 기본값(None) 사용
+        - 모델 최대 길이를 넘는 값은 최대 길이로 제한
+        """
+        if segment is None and self.device.startswith("cuda"):
+            props = torch.cuda.get_device_properties(torch.device(self.device))
+            if props.total_memory / 1024 ** 3 < SMALL_GPU_MEMORY_GB:
+                segment = SMALL_GPU_SEGMENT
+
+        max_segment = self._max_segment()
+        if segment is not None and max_segment is not None and segment > max_segment:
+            print(f"[Init] segment={segment}s exceeds model limit, using {max_segment:.2f}s")
+            segment = max_segment
+
+        return segment
+
+    def _compile_model(self) -> None:
+        """
+        각 서브 모델의 forward를 torch.compile로 감싸고, 꽉 찬 segment 배치 크기로 한 번 실행하여 워밍업함.
+        모델 객체 자체를 감싸면 apply_model의 HTDemucs/BagOfModels 타입 분기가 깨지므로 forward만 교체함.
+        forward를 교체하는 모델은 compiled=True 키로 캐시된 전용 사본이므로, 컴파일하지 않는 Separator에는
+        영향이 없음. 마지막(덜 찬) 배치의 shape는 곡 길이마다 다르므로 처음 나올 때 따로 캡처됨.
+        """
+        print("[Init] Compiling Demucs model with torch.compile (mode='reduce-overhead')...")
+        models = getattr(self.model, "models", [self.model])
+        if all(getattr(m, "_compiled_forward", False) for m in models):
+            # 캐시에서 공유받은 모델이 이미 컴파일된 경우
+            return
+        for m in models:
+            m.forward = torch.compile(m.forward, mode="reduce-overhead", fullgraph=False)
+            m._compiled_forward = True
+        
+        # 모든 chunk는 같은 길이로 패딩되므로, segment_batch개가 꽉 찬 배치 하나로 워밍업하면
+        # 곡 대부분에 쓰이는 shape의 그래프가 여기서 캡처됨
+        warmup_seconds = self.segment or self._max_segment() or SMALL_GPU_SEGMENT
+        segment_length = int(warmup_seconds * self.sample_rate)
+        stride = int((1 - self.overlap) * segment_length)
+        length = segment_length if self.segment_batch == 1 else self.segment_batch * stride
+        dummy = np.zeros((2, length), dtype=np.float32)
+        self.separate_memory(dummy)
+
+    def _to_device(self, audio: np.ndarray) -> torch.Tensor:
+        """
+        NumPy 배열을 모델 장치의 float32 텐서로 옮김. (모델은 입력을 수정하지 않으므로 메모리 공유가 안전함)
+        CUDA에서는 재사용하는 pinned 버퍼를 거쳐 non_blocking 복사를 수행함 (pageable 메모리 복사보다 빠름).
+        이전 호출의 결과는 CPU로 복사되며 동기화되므로, 다음 호출에서 버퍼를 덮어써도 안전함.
+        """
+        if not self.device.startswith("cuda"):
+            # 이미 float32 연속 배열이면 복사 없이 메모리를 공유 (전치된 view 등은 여기서 한 번만 복사)
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+            if not audio.flags.writeable:
+                audio = audio.copy()
+            return torch.from_numpy(audio).to(self.device)
+        
+        if self._pinned is None or self._pinned.numel() < audio.size:
+            self._pinned = torch.empty(audio.size, dtype=torch.float32, pin_memory=True)
+        
+        staging = self._pinned[:audio.size].view(audio.shape)
+        # 전치된 view나 float64 입력도 여기서 한 번에 변환/복사
+        staging.numpy()[...] = audio
+        return staging.to(self.device, non_blocking=True)
 
-    def separate_memory(self, audio: np.ndarray, shifts=0) -> dict:
+    def _autocast_dtype(self) -> Optional[torch.dtype]:
+        """
+        precision 설정에 따른 autocast dtype (None이면 FP32로 추론)
+        "auto"일 때 CUDA에서는 BF16(지원 시, Ampere 이상) 또는 FP16, MPS에서는 FP16으로 추론하고
+        그 외 장치는 FP32를 유지
+        """
+        if self.device == "cpu" or self.precision == "fp32":
+            return None
+        if self.precision != "auto":
+            return PRECISION_DTYPES[self.precision]
+        if self.device.startswith("cuda"):
+            return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        if self.device.startswith("mps"):
+            return torch.float16
+        return None
+
+    def separate_memory(
+        self,
+        audio: np.ndarray,
+        shifts=0,
+        keep: Optional[Sequence[str]] = None,
+        sample_rate: Optional[int] = None
+    ) -> dict:
         """
         메모리 상의 오디오 데이터를 받아서 분리된 Stems(딕셔너리)를 반환
         :param audio: (Channels, Time) 또는 (Time,) 형태의 Numpy 배열
         :param shifts: 0=fast(추천), 1=high-quality
+        :param keep: 반환할 stem 이름들. 지정하면 해당 stem만 CPU로 복사함 (None이면 전체)
+        :param sample_rate: 입력의 샘플레이트. 모델 샘플레이트와 다르면 장치 위에서 리샘플링함
+            (None이면 이미 모델 샘플레이트라고 가정). 반환되는 stem은 항상 모델 샘플레이트임
         :return: {'vocals': array, 'guitar': array, ...}
         """
         # 차원 (Demucs [Batch, Channels, Time])
+        # 입력은 core.io 규약대로 (Channels, Samples)이므로 전치 없이 batch 차원만 추가
         if audio.ndim == 1:
             # Mono: (Samples,) -> (1, 1, Samples)
             audio = audio[None, None, :] 
         elif audio.ndim == 2:
-            # Stereo: Ensure (Channels, Samples)
-            if audio.shape[0] > audio.shape[1]:
-                audio = audio.T
             # Add batch dim: (Channels, Samples) -> (1, Channels, Samples)
             audio = audio[None, :, :]
         
-        # 텐서 변환
-        wav = torch.tensor(audio, dtype=torch.float32).to(self.device)
-        
-        # 모델 적용 (분리 수행)
-        with torch.no_grad():
-            sources = apply_model(
-                self.model, 
-                wav,
-                split=True,
-                overlap=0.25,
-                shifts=shifts
-            )[0]
+        # 업로드/리샘플링/stem 선택/CPU 복사까지 autograd 기록 없이 수행 (모델 실행은 _apply 안에서도 inference_mode)
+        with torch.inference_mode():
+            # 텐서 변환
+            wav = self._to_device(audio)
+            
+            if sample_rate is not None and sample_rate != self.sample_rate:
+                wav = julius.resample_frac(wav, int(sample_rate), int(self.sample_rate))
+            
+            source_names, sources = self._to_host(self._apply(wav, shifts), keep)
 
         stems = {}
-        source_names = self.model.sources # ['drums', 'bass', 'other', 'vocals', 'guitar', 'piano']
         
-        for name, source in zip(source_names, sources):
-            stems[name] = source.cpu().numpy()
+        # 각 stem은 CPU 버퍼의 view(복사 없음)로 반환
+        for name, source in zip(source_names, sources[0]):
+            stems[name] = source.numpy()
 
         return stems
 
+    def separate_batch(
+        self,
+        audios: List[np.ndarray],
+        shifts=0,
+        keep: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, np.ndarray]]:
+        """
+        여러 곡을 하나의 배치 텐서로 묶어 apply_model 한 번으로 분리함.
+        짧은 곡은 가장 긴 곡 길이에 맞춰 0으로 패딩하고, 결과는 각 곡의 원래 길이로 잘라서 반환함.
+        :param audios: (Channels, Time) 또는 (Time,) 형태의 Numpy 배열 리스트 (모노는 스테레오로 복제)
+        :param shifts: 0=fast(추천), 1=high-quality
+        :param keep: 반환할 stem 이름들 (None이면 전체)
+        :return: 곡 순서대로 {'vocals': array, 'guitar': array, ...} 딕셔너리의 리스트
+        """
+        items = []
+        for audio in audios:
+            if audio.ndim == 1:
+                audio = audio[None, :]
+            items.append(audio)
+        
+        channels = max(a.shape[0] for a in items)
+        lengths = [a.shape[1] for a in items]
+        
+        # (B, C, T_max) 배치 버퍼에 바로 채워 넣음 (모노 입력은 채널 방향으로 브로드캐스트)
+        batch = np.zeros((len(items), channels, max(lengths)), dtype=np.float32)
+        for i, audio in enumerate(items):
+            batch[i, :, :audio.shape[1]] = audio
+        
+        with torch.inference_mode():
+            wav = self._to_device(batch)
+            source_names, sources = self._to_host(self._apply(wav, shifts), keep)
+        
+        results = []
+        for i, length in enumerate(lengths):
+            results.append({
+                name: source[:, :length].numpy()
+                for name, source in zip(source_names, sources[i])
+            })
+        return results
+
+    def _apply(self, wav: torch.Tensor, shifts=0) -> torch.Tensor:
+        """
+        (Batch, Channels, Time) 텐서에 모델을 적용하고 (Batch, Sources, Channels, Time) float32 텐서를 반환
+        (autograd 기록 없이 / GPU에서는 reduced precision, 결과는 모델 장치에 남아 있음)
+        """
+        dtype = self._autocast_dtype()
+        device_type = self.device.split(":")[0]
+        autocast = torch.autocast(device_type=device_type, dtype=dtype) if dtype else nullcontext()
+        with torch.inference_mode(), autocast:
+            if self.segment_batch > 1 and not shifts:
+                sources = _apply_model_batched(
+                    self.model, wav, self.segment, self.overlap, self.segment_batch
+                ).float()
+            else:
+                sources = apply_model(
+                    self.model, 
+                    wav,
+                    split=True,
+                    overlap=self.overlap,
+                    segment=self.segment,
+                    shifts=shifts
+                ).float()
+        return sources
+
+    def _to_host(
+        self,
+        sources: torch.Tensor,
+        keep: Optional[Sequence[str]] = None
+    ) -> Tuple[List[str], torch.Tensor]:
+        """
+        필요한 stem만 장치에서 골라낸 뒤 GPU -> CPU 복사를 한 번만 수행함.
+        :return: (stem 이름 리스트, (Batch, len(names), Channels, Time) CPU 텐서)
+        """
+        source_names = list(self.model.sources) # ['drums', 'bass', 'other', 'vocals', 'guitar', 'piano']
+        if keep is not None:
+            indices = [i for i, name in enumerate(source_names) if name in keep]
+            source_names = [source_names[i] for i in indices]
+            sources = sources[:, indices]
+        return source_names, sources.cpu()
+
+    def separate_chunks(
+        self,
+        audio: np.ndarray,
+        segment: float = 30.0,
+        overlap: float = 1.0,
+        shifts=0,
+        keep: Optional[Sequence[str]] = None
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        메모리 상의 오디오를 segment 단위로 분리하여 순차적으로 반환
+        (다음 segment를 분리하는 동안 호출 측에서 이전 결과를 후처리할 수 있음)
+        :param audio: (C, T) 또는 (T,) 입력 오디오 (모델 샘플레이트 기준)
+        :param segment: 한 번에 분리할 길이 (초)
+        :param overlap: 각 segment 앞뒤로 함께 분리하는 문맥 길이 (초). 분리 후 잘라내어 경계 아티팩트를 줄임
+        :param shifts: 0=fast(추천), 1=high-quality
+        :param keep: 반환할 stem 이름들 (None이면 전체)
+        :return: segment마다 {'vocals': (C, T) array, ...} 를 yield (이어 붙이면 입력 길이와 같음)
+        """
+        if audio.ndim == 1:
+            audio = audio[None]
+
+        hop = int(segment * self.sample_rate)
+        context = int(overlap * self.sample_rate)
+        total = audio.shape[-1]
+
+        try:
+            for start in range(0, total, hop):
+                # 앞뒤 문맥을 포함한 구간을 분리하고, 분리 후 가운데 구간만 사용 (separate_stream과 동일)
+                read_start = max(0, start - context)
+                read_end = min(total, start + hop + context)
+                stems = self.separate_memory(audio[:, read_start:read_end], shifts=shifts, keep=keep)
+
+                offset = start - read_start
+                length = min(hop, total - start)
+                yield {
+                    name: source[:, offset:offset + length]
+                    for name, source in stems.items()
+                }
+        finally:
+            if self.device.startswith("cuda"):
+                torch.cuda.empty_cache()
+
+    def separate_stream(
+        self,
+        audio_path: str,
+        segment: float = 30.0,
+        overlap: float = 1.0,
+        shifts=0,
+        keep: Optional[Sequence[str]] = None
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        파일 전체를 메모리에 올리지 않고 segment 단위로 읽어 분리 결과를 순차적으로 반환
+        (RAM/VRAM 사용량이 곡 길이가 아닌 segment 길이에 비례)
+        :param audio_path: 입력 오디오 파일 경로
+        :param segment: 한 번에 분리할 길이 (초)
+        :param overlap: 각 segment 앞뒤로 함께 읽는 문맥 길이 (초). 분리 후 잘라내어 경계 아티팩트를 줄임
+        :param shifts: 0=fast(추천), 1=high-quality
+        :param keep: 반환할 stem 이름들 (None이면 전체)
+        :return: segment마다 {'vocals': (C, T) array, ...} 를 yield
+        """
+        try:
+            from pedalboard.io import AudioFile
+        except ImportError:
+            raise ImportError(
+                "Pedalboard is not installed. Please install it with:\n"
+                "pip install pedalboard"
+            )
+
+        hop = int(segment * self.sample_rate)
+        context = int(overlap * self.sample_rate)
+
+        # segment마다 입력/출력 텐서 크기가 같으므로 CUDA 캐싱 할당기가 이전 segment의 블록을
+        # 그대로 재사용함. 중간에 empty_cache를 호출하면 이 재사용이 깨지므로 끝난 뒤 한 번만 반환
+        try:
+            with AudioFile(str(audio_path)).resampled_to(self.sample_rate) as f:
+                total = f.frames
+                # 파일은 앞에서부터 한 번만 순차적으로 읽고, 다음 segment의 앞 문맥으로 쓸 부분만 버퍼에 남김
+                # (seek로 문맥 구간을 다시 디코딩하지 않음)
+                buffer = np.zeros((f.num_channels, 0), dtype=np.float32)
+                buffer_start = 0
+                for start in range(0, total, hop):
+                    # 앞뒤 문맥을 포함한 구간을 분리하고, 분리 후 가운데 구간만 사용
+                    read_start = max(0, start - context)
+                    read_end = min(total, start + hop + context)
+                    missing = read_end - (buffer_start + buffer.shape[1])
+                    if missing > 0:
+                        buffer = np.concatenate([buffer, f.read(missing)], axis=1)
+                    # 리샘플링된 파일은 frames 추정치보다 실제 길이가 짧을 수 있음
+                    read_end = min(read_end, buffer_start + buffer.shape[1])
+                    if read_end <= start:
+                        break
+                    chunk = buffer[:, read_start - buffer_start:read_end - buffer_start]
+
+                    stems = self.separate_memory(chunk, shifts=shifts, keep=keep)
+
+                    offset = start - read_start
+                    length = min(hop, read_end - start)
+                    yield {
+                        name: source[:, offset:offset + length]
+                        for name, source in stems.items()
+                    }
+
+                    # 다음 segment의 앞 문맥 이전 구간은 더 이상 필요 없음
+                    drop = max(0, start + hop - context) - buffer_start
+                    if drop > 0:
+                        buffer = buffer[:, drop:]
+                        buffer_start += drop
+        finally:
+            if self.device.startswith("cuda"):
+                torch.cuda.empty_cache()
+
     def separate_file(self, audio_path: str, shifts=0) -> dict:
         """
         파일 경로를 받아 로드 후 즉시 분리하여 메모리 데이터로 반환
         """
         print(f"Loading: {audio_path}")
-        # Use standardized load_audio
-        audio, _ = load_audio(audio_path, sr=self.sample_rate)
+        if self.device.startswith("cuda"):
+            # 원본 샘플레이트로 읽고 GPU로 올린 뒤 리샘플링 (CPU 리샘플링 생략)
+            audio, sr = load_audio(audio_path, sr=None)
+        else:
+            # Use standardized load_audio
+            audio, sr = load_audio(audio_path, sr=self.sample_rate)
         
         print(f"Separating in memory (shifts={shifts})...")
-        return self.separate_memory(audio, shifts=shifts)
+        return self.separate_memory(audio, shifts=shifts, sample_rate=sr)
     
     
 if __name__ == "__main__":
@@ -1,12 +1,46 @@
 from pedalboard import (
-    Compressor, Distortion, 
-    Chorus, Delay, Reverb, Gain, NoiseGate,
-    LowpassFilter, HighpassFilter,
-    Limiter, Phaser, Pedalboard
+    Compressor, Distortion,
+    Chorus, Reverb, NoiseGate,
+    Pedalboard
 )
 import numpy as np
 from typing import Dict, Optional
 
+
+# Preset name -> function building that preset's plugin list from the user params.
+# Unknown presets fall back to _FALLBACK_PRESET.
+PRESETS = {
+    # Clean: Compressor -> Chorus -> Reverb
+    "clean": lambda p: [
+        Compressor(threshold_db=p.get("comp_threshold_db", -15.0), ratio=4.0, attack_ms=5.0, release_ms=50.0),
+        Chorus(rate_hz=p.get("chorus_rate_hz", 1.0), depth=0.25, centre_delay_ms=7.0, mix=0.3),
+        Reverb(room_size=p.get("reverb_room_size", 0.4), damping=0.5, wet_level=0.33, dry_level=0.4),
+    ],
+    # Distortion: NoiseGate -> Distortion -> Reverb
+    "distortion": lambda p: [
+        NoiseGate(threshold_db=p.get("gate_threshold_db", -50.0), ratio=10, release_ms=100),
+        Distortion(drive_db=p.get("drive_db", 30.0)),
+        Reverb(room_size=p.get("reverb_room_size", 0.3), damping=0.5, wet_level=0.33, dry_level=0.4),
+    ],
+    # Crunch: Compressor -> Mild Distortion -> Reverb
+    "crunch": lambda p: [
+        Compressor(threshold_db=p.get("comp_threshold_db", -20.0), ratio=4.0),
+        Distortion(drive_db=p.get("drive_db", 15.0)),
+        Reverb(room_size=p.get("reverb_room_size", 0.3), damping=0.5, wet_level=0.33, dry_level=0.4),
+    ],
+}
+_FALLBACK_PRESET = lambda p: [Compressor(), Reverb()]
+
+
+def _make_board(preset: str, params: Dict) -> Pedalboard:
+    build = PRESETS.get(preset)
+    if build is None:
+        # Default to clean if unknown
+        print(f"[GuitarEffectsChain] Unknown preset '{preset}'. Using clean.")
+        build = _FALLBACK_PRESET
+    return Pedalboard(build(params))
+
+
 class GuitarEffectsChain:
     """
     Guitar Effects Chain
@@ -38,71 +72,66 @@ class GuitarEffectsChain:
         self.preset = preset
         self.params = kwargs
         self.board = custom_board
+        # Reusable float32 input buffer for callers passing float64 / non-contiguous audio
+        self._scratch = None
         
         # Merge defaults with provided params if needed, 
-        # but here we just use kwargs directly or fallback to defaults in _build_board
+        # but here we just use kwargs directly or fallback to defaults in _make_board
         
         if self.board is None:
             self._build_board()
 
     def _build_board(self):
-        effects = []
-        
-        if self.preset == "clean":
-            # Clean: Compressor -> Chorus -> Reverb
-            comp_thresh = self.params.get("comp_threshold_db", -15.0)
-            chorus_rate = self.params.get("chorus_rate_hz", 1.0)
-            reverb_size = self.params.get("reverb_room_size", 0.4)
-            
-            effects.append(Compressor(threshold_db=comp_thresh, ratio=4.0, attack_ms=5.0, release_ms=50.0))
-            effects.append(Chorus(rate_hz=chorus_rate, depth=0.25, centre_delay_ms=7.0, mix=0.3))
-            effects.append(Reverb(room_size=reverb_size, damping=0.5, wet_level=0.33, dry_level=0.4))
-            
-        elif self.preset == "distortion":
-            # Distortion: NoiseGate -> Distortion -> Reverb
-            gate_thresh = self.params.get("gate_threshold_db", -50.0)
-            drive = self.params.get("drive_db", 30.0)
-            reverb_size = self.params.get("reverb_room_size", 0.3)
-            
-            effects.append(NoiseGate(threshold_db=gate_thresh, ratio=10, release_ms=100))
-            effects.append(Distortion(drive_db=drive))
-            effects.append(Reverb(room_size=reverb_size, damping=0.5, wet_level=0.33, dry_level=0.4))
-            
-        elif self.preset == "crunch":
-            # Crunch: Compressor -> Mild Distortion -> Reverb
-            comp_thresh = self.params.get("comp_threshold_db", -20.0)
-            drive = self.params.get("drive_db", 15.0)
-            reverb_size = self.params.get("reverb_room_size", 0.3)
-            
-            effects.append(Compressor(threshold_db=comp_thresh, ratio=4.0))
-            effects.append(Distortion(drive_db=drive))
-            effects.append(Reverb(room_size=reverb_size, damping=0.5, wet_level=0.33, dry_level=0.4))
-            
-        else:
-            # Default to clean if unknown
-            print(f"[GuitarEffectsChain] Unknown preset '{self.preset}'. Using clean.")
-            effects.append(Compressor())
-            effects.append(Reverb())
+        self.board = _make_board(self.preset, self.params)
 
-        self.board = Pedalboard(effects)
-
-    def process(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    def process(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        reset: bool = True,
+        channels_first: Optional[bool] = None
+    ) -> np.ndarray:
+        """
+        Apply the chain to (C, T), (T, C) or (T,) audio.
+        
+        reset=False keeps plugin state (reverb tails, compressor envelopes) from the previous
+        call, so consecutive chunks of one signal are processed as if it were a single pass.
+        
+        channels_first states the layout of 2-D input: True for (C, T), False for (T, C).
+        The output has the same layout as the input. None guesses from the shape (the longer
+        axis is time), which is wrong for clips shorter than their channel count -- pass it
+        explicitly when the layout is known.
+        """
         if self.board is None:
             self._build_board()
             
-        input_audio = audio.copy()
+        # Pedalboard does not modify its input, so work on views instead of a defensive copy
+        input_audio = audio
         
         # If input is (T,), make it (1, T)
         if input_audio.ndim == 1:
             input_audio = input_audio[np.newaxis, :]
             
-        # Check shape. If (T, C) where T > C, transpose to (C, T)
+        # (T, C) -> (C, T) view; guess from the shape only when the caller did not say
+        if channels_first is None:
+            channels_first = input_audio.shape[0] <= input_audio.shape[1]
         transposed = False
-        if input_audio.shape[0] > input_audio.shape[1]: 
-             input_audio = input_audio.T
-             transposed = True
+        if not channels_first:
+            input_audio = input_audio.T
+            transposed = True
+        
+        # Contiguous float32 (the usual stem) goes straight to Pedalboard. Anything else is
+        # cast once into a scratch buffer that is kept and reused across calls (batch use),
+        # instead of allocating a fresh float32 copy per file.
+        if input_audio.dtype != np.float32 or not input_audio.flags.c_contiguous:
+            # Flat buffer reshaped per call, so the (C, T) view is always contiguous
+            if self._scratch is None or self._scratch.size < input_audio.size:
+                self._scratch = np.empty(input_audio.size, dtype=np.float32)
+            scratch = self._scratch[:input_audio.size].reshape(input_audio.shape)
+            np.copyto(scratch, input_audio, casting='unsafe')
+            input_audio = scratch
              
-        processed = self.board(input_audio, sample_rate)
+        processed = self.board(input_audio, sample_rate, reset=reset)
         
         if transposed:
             processed = processed.T
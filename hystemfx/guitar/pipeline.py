@@ -6,12 +6,17 @@ Guitar Processing Pipeline
 설정된 이펙트 체인을 적용하여 최종 결과물을 생성하는 파이프라인을 제공합니다.
 """
 
+import os
+import threading
 import numpy as np
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, Union, Dict
 from pathlib import Path
 
 from .separator import GuitarSeparator, separate_guitar
 from .effects import GuitarEffectsChain
+from hystemfx.core.io import readahead
 
 class GuitarPipeline:
     """
@@ -31,6 +36,8 @@ class GuitarPipeline:
         separation_model: str = "htdemucs_6s",
         device: Optional[str] = None,
         effect_preset: str = "clean",
+        segment: Optional[float] = None,
+        overlap: float = 1.0,
         **effect_params
     ):
         """
@@ -39,9 +46,14 @@ class GuitarPipeline:
         :param separation_model: 사용할 Demucs 모델 이름 (기본값: "htdemucs_6s")
         :param device: 연산에 사용할 디바이스 ('cuda', 'cpu' 또는 None). None일 경우 자동 선택됨.
         :param effect_preset: 적용할 이펙트 프리셋 이름 (예: "clean", "distortion", "crunch")
+        :param segment: 지정하면 `process`가 오디오를 이 길이(초) 단위로 분리하면서, 앞 구간의 이펙트 처리를
+            다음 구간의 분리와 동시에 진행함 (None이면 전체 분리 후 이펙트 적용)
+        :param overlap: segment 단위 분리 시 앞뒤로 함께 분리할 문맥 길이 (초)
         :param effect_params: 이펙트 체인에 전달할 추가 파라미터들
         """
         self.separator = GuitarSeparator(model_name=separation_model, device=device)
+        self.segment = segment
+        self.overlap = overlap
         self.effect_preset = effect_preset
         self.effect_params = effect_params
         # GuitarEffectsChain takes preset in init
@@ -69,6 +81,13 @@ class GuitarPipeline:
             - 기본적으로 처리된 기타 오디오 배열(np.ndarray)을 반환함.
             - `return_all_stems=True`인 경우, `{'guitar': ..., 'guitar_processed': ..., ...}` 형태의 딕셔너리를 반환함.
         """
+        total = audio.shape[-1]
+        if (
+            apply_effects and not return_all_stems and self.segment is not None
+            and total > int(self.segment * self.separator.sample_rate)
+        ):
+            return self._process_pipelined(audio, sample_rate)
+        
         print("Step 1/2: Separating guitar from mix...")
         
         # 음원 분리
@@ -81,8 +100,8 @@ class GuitarPipeline:
         # 이펙트 적용
         if apply_effects:
             print("Step 2/2: Applying effects chain...")
-            # GuitarEffectsChain.process takes (audio, sample_rate)
-            processed = self.effects_chain.process(guitar_audio, sample_rate)
+            # 분리 결과는 항상 (C, T)이므로 레이아웃을 명시함 (짧은 구간도 shape 추측 없이 처리)
+            processed = self.effects_chain.process(guitar_audio, sample_rate, channels_first=True)
             
             if return_all_stems:
                 stems["guitar_processed"] = processed
@@ -95,12 +114,66 @@ class GuitarPipeline:
             else:
                 return guitar_audio
     
+    def _keep(self) -> list:
+        """분리 결과 중 CPU로 가져올 스템 (기타, 없으면 fallback용 'other')."""
+        target = self.separator.target_stem
+        return [target if target in self.separator.model.sources else "other"]
+    
+    def _run_segments(self, chunks, sample_rate: int, apply_effects: bool, sink) -> None:
+        """
+        segment 단위 분리 결과를 이펙트 처리하여 `sink(audio, start)`로 순서대로 넘김.
+        
+        분리(GPU)는 호출 스레드에서 `chunks`를 순회하며 진행하고, 직전 구간의 이펙트와 sink(CPU/I/O)는
+        워커 스레드에서 동시에 처리함. 처리 시간은 두 단계의 합이 아니라 더 느린 쪽에 맞춰짐.
+        이펙트 체인은 첫 구간에서만 리셋하여 리버브 꼬리/컴프레서 상태가 구간 경계를 넘어 이어지므로
+        전체를 한 번에 처리한 것과 같은 결과가 나옴 (별도 overlap-add 불필요).
+        """
+        stem = self._keep()[0]
+        
+        def apply(chunk: np.ndarray, start: int, reset: bool) -> None:
+            if apply_effects:
+                chunk = self.effects_chain.process(chunk, sample_rate, reset=reset, channels_first=True)
+            sink(chunk, start)
+        
+        # 이펙트 워커는 하나만 둬서 구간 순서와 플러그인 상태를 유지하고,
+        # 분리된 구간이 메모리에 쌓이지 않도록 대기 중인 작업은 최대 2개로 제한
+        pending = deque()
+        position = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for i, stems in enumerate(chunks):
+                chunk = stems[stem]
+                pending.append(executor.submit(apply, chunk, position, i == 0))
+                position += chunk.shape[1]
+                while len(pending) >= 2:
+                    pending.popleft().result()
+            while pending:
+                pending.popleft().result()
+    
+    def _process_pipelined(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """메모리 상의 오디오를 segment 단위로 분리하면서 이펙트를 동시에 적용함."""
+        print(f"Separating + applying effects in {self.segment}s segments (pipelined)...")
+        
+        output = None
+        
+        def sink(processed: np.ndarray, start: int) -> None:
+            nonlocal output
+            if output is None:
+                output = np.empty((processed.shape[0], audio.shape[-1]), dtype=np.float32)
+            output[:, start:start + processed.shape[1]] = processed
+        
+        chunks = self.separator.separate_chunks(
+            audio, segment=self.segment, overlap=self.overlap, keep=self._keep()
+        )
+        self._run_segments(chunks, sample_rate, True, sink)
+        return output
+    
     def process_file(
         self,
         input_path: Union[str, Path],
         output_path: Optional[Union[str, Path]] = None,
         apply_effects: bool = True,
-        save_separated_only: bool = False
+        save_separated_only: bool = False,
+        segment: Optional[float] = None
     ) -> Optional[np.ndarray]:
         """
         오디오 파일을 읽어서 분리 및 이펙트 처리를 수행하고, 결과를 파일로 저장함.
@@ -109,8 +182,11 @@ class GuitarPipeline:
         :param output_path: 처리된 오디오를 저장할 경로 (None일 경우 저장하지 않음)
         :param apply_effects: 이펙트 적용 여부 (기본값: True)
         :param save_separated_only: True일 경우 이펙트 처리 없이 분리된 원본(Clean) 스템만 저장함.
+        :param segment: 이 호출에서만 사용할 스트리밍 segment 길이(초). None이면 인스턴스의 `segment` 설정을 따름.
+            지정되면 파일 전체를 메모리에 올리지 않고 segment 단위로 읽기/분리/이펙트/쓰기를 반복함.
         
-        :return: 처리된 오디오 데이터 (NumPy 배열)
+        :return: 처리된 오디오 데이터 (NumPy 배열). 스트리밍 모드에서 `output_path`가 주어지면
+            결과를 메모리에 모으지 않으므로 None을 반환함.
         :raises ImportError: pedalboard 라이브러리가 설치되지 않은 경우 발생
         """
         try:
@@ -121,6 +197,15 @@ class GuitarPipeline:
                 "pip install pedalboard"
             )
         
+        segment = segment if segment is not None else self.segment
+        if segment is not None:
+            return self._process_file_streaming(
+                input_path,
+                output_path,
+                apply_effects=apply_effects and not save_separated_only,
+                segment=segment
+            )
+        
         # 오디오 파일 로드
         print(f"Loading audio from: {input_path}")
         with AudioFile(str(input_path)) as f:
@@ -146,34 +231,160 @@ class GuitarPipeline:
         
         return processed
     
+    def _process_file_streaming(
+        self,
+        input_path: Union[str, Path],
+        output_path: Optional[Union[str, Path]],
+        apply_effects: bool,
+        segment: float
+    ) -> Optional[np.ndarray]:
+        """
+        파일을 `segment` 단위로 읽고 분리/이펙트 처리한 뒤 곧바로 출력 파일에 기록함.
+        
+        메모리 사용량은 곡 길이가 아닌 segment 길이에 비례함. 출력은 모델 샘플레이트로 기록됨.
+        """
+        from pedalboard.io import AudioFile
+        
+        print(f"Streaming audio from: {input_path} (segment={segment}s, overlap={self.overlap}s)")
+        sample_rate = self.separator.sample_rate
+        
+        out_file = None
+        chunks = []
+        
+        def sink(processed: np.ndarray, start: int) -> None:
+            nonlocal out_file
+            if output_path is None:
+                chunks.append(processed)
+                return
+            if out_file is None:
+                out_file = AudioFile(str(output_path), 'w', sample_rate, processed.shape[0])
+            out_file.write(processed)
+        
+        try:
+            stream = self.separator.separate_stream(
+                input_path, segment=segment, overlap=self.overlap, keep=self._keep()
+            )
+            self._run_segments(stream, sample_rate, apply_effects, sink)
+        finally:
+            if out_file is not None:
+                out_file.close()
+        
+        if output_path is not None:
+            print(f"Processed audio saved to: {output_path}")
+            return None
+        
+        return np.concatenate(chunks, axis=1)
+    
     def batch_process(
         self,
         input_files: list,
         output_dir: Union[str, Path],
-        apply_effects: bool = True
+        apply_effects: bool = True,
+        num_workers: Optional[int] = None,
+        prefetch: int = 2
     ):
         """
         여러 오디오 파일을 일괄 처리(Batch Processing)함.
+        
+        분리(GPU)는 메인 스레드에서 순서대로 수행하고, 이펙트 적용과 저장(CPU)은 워커 스레드로 넘겨
+        다음 파일의 분리와 겹쳐서 실행함. Pedalboard는 처리 중 GIL을 해제하므로 스레드만으로 병렬화됨.
 
         :param input_files: 입력 파일 경로들의 리스트
         :param output_dir: 결과 파일을 저장할 디렉토리 경로
         :param apply_effects: 이펙트 적용 여부
+        :param num_workers: 이펙트/저장 워커 스레드 수 (None이면 CPU 코어 수의 절반)
+        :param prefetch: 분리 중에 미리 읽어(디코딩해) 둘 파일 수. 0이면 분리 직전에 순서대로 읽음.
         """
+        try:
+            from pedalboard.io import AudioFile
+        except ImportError:
+            raise ImportError("Pedalboard is not installed.")
+        
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        for i, input_file in enumerate(input_files):
-            input_path = Path(input_file)
-            output_path = output_dir / f"{input_path.stem}_guitar_processed{input_path.suffix}"
-            
-            print(f"\n[{i+1}/{len(input_files)}] Processing: {input_path.name}")
+        num_workers = num_workers or max(1, (os.cpu_count() or 2) // 2)
+        
+        # Pedalboard 플러그인 상태는 스레드 간 공유할 수 없으므로 워커마다 이펙트 체인을 따로 둠
+        local = threading.local()
+        
+        def finish(guitar_audio: np.ndarray, sample_rate: int, output_path: Path) -> None:
+            processed = guitar_audio
+            if apply_effects:
+                chain = getattr(local, "chain", None)
+                if chain is None:
+                    chain = local.chain = GuitarEffectsChain(preset=self.effect_preset, **self.effect_params)
+                processed = chain.process(guitar_audio, sample_rate, channels_first=True)
             
+            with AudioFile(str(output_path), 'w', sample_rate, processed.shape[0]) as f:
+                f.write(processed)
+        
+        def load(input_path: Path):
+            with AudioFile(str(input_path)) as f:
+                return f.read(f.frames), f.samplerate
+        
+        def report(input_path: Path, output_path: Path, future: Future) -> None:
             try:
-                self.process_file(input_path, output_path, apply_effects=apply_effects)
+                future.result()
                 print(f"  ✓ Saved to: {output_path}")
-                
             except Exception as e:
                 print(f"  ✗ Error processing {input_path.name}: {e}")
+        
+        # 분리된 스템이 메모리에 쌓이지 않도록 대기 중인 작업 수를 제한
+        max_pending = 2 * num_workers
+        pending = deque()
+        
+        # 스트리밍 모드는 process_file이 segment 단위로 직접 읽으므로 미리 읽지 않음
+        streaming = self.segment is not None
+        input_paths = [Path(input_file) for input_file in input_files]
+        window = max(0, prefetch)
+        loads = deque()
+        
+        def schedule_load(j: int) -> None:
+            if window and not streaming and j < len(input_paths):
+                loads.append(reader.submit(load, input_paths[j]))
+                # 그 다음 윈도우의 파일은 디스크 읽기만 커널에 미리 맡겨 둠 (디코딩 중 I/O 지연 숨김)
+                if j + window < len(input_paths):
+                    readahead(input_paths[j + window])
+        
+        with ThreadPoolExecutor(max_workers=num_workers) as executor, \
+                ThreadPoolExecutor(max_workers=max(1, window)) as reader:
+            # 디코딩(I/O)을 분리(GPU)와 겹치도록 다음 파일들을 미리 읽기 시작
+            for j in range(window):
+                schedule_load(j)
+            
+            for i, input_path in enumerate(input_paths):
+                output_path = output_dir / f"{input_path.stem}_guitar_processed{input_path.suffix}"
+                
+                print(f"\n[{i+1}/{len(input_files)}] Processing: {input_path.name}")
+                
+                try:
+                    if streaming:
+                        # 스트리밍 모드는 이미 메모리 사용량이 segment 단위로 제한되므로 그대로 처리
+                        self.process_file(input_path, output_path, apply_effects=apply_effects)
+                        print(f"  ✓ Saved to: {output_path}")
+                        continue
+                    
+                    if window:
+                        load_future = loads.popleft()
+                        schedule_load(i + window)
+                        audio, sample_rate = load_future.result()
+                    else:
+                        audio, sample_rate = load(input_path)
+                    
+                    # 분리 (GPU) -> 이펙트 + 저장 (CPU, 다음 파일 분리와 병렬 진행)
+                    guitar_audio = self.separator.separate(audio, sample_rate)
+                    future = executor.submit(finish, guitar_audio, sample_rate, output_path)
+                    pending.append((input_path, output_path, future))
+                    
+                except Exception as e:
+                    print(f"  ✗ Error processing {input_path.name}: {e}")
+                
+                while len(pending) >= max_pending:
+                    report(*pending.popleft())
+            
+            while pending:
+                report(*pending.popleft())
 
 
 def process_guitar_from_mix(
@@ -1,9 +1,14 @@
 import os
 import sys
+import json
+import threading
+import multiprocessing as mp
 import torch
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, Optional, Union, Callable
+from typing import Dict, List, Optional, Tuple, Union, Callable
 try:
     from pedalboard import Pedalboard
 except ImportError:
@@ -15,8 +20,8 @@ root_path = os.path.dirname(os.path.dirname(current_file_path))
 if root_path not in sys.path:
     sys.path.append(root_path)
 
-from hystemfx.core.separator import DemucsSeparator
-from hystemfx.core.io import load_audio, save_audio
+from hystemfx.core.separator import DemucsSeparator, default_device
+from hystemfx.core.io import load_audio, save_audio, AudioWriter
 from hystemfx.vocal.effects import VocalRack
 from hystemfx.synth.effects import SynthEffectsChain
 from hystemfx.guitar.effects import GuitarEffectsChain
@@ -55,33 +60,11 @@ def process_stem(
     processed_audio = None
     
     try:
-        if session_type == "vocals":
-            rack = VocalRack(preset=preset)
-            processed_audio = rack.process(audio, sr)
-            
-        elif session_type == "piano":
-            # Handle synth preset logic
-            chain_params = {}
-            if isinstance(preset, str):
-                if preset == "bright":
-                    chain_params = {"eq_mid_gain_db": 3.0, "eq_high_gain_db": 2.5, "chorus_mix": 0.4}
-                elif preset == "warm":
-                    chain_params = {"eq_low_gain_db": 1.5, "eq_mid_gain_db": 1.0, "eq_high_gain_db": -1.0}
-                chain = SynthEffectsChain(**chain_params)
-            else:
-                # Assume custom object if supported, or just default
-                chain = SynthEffectsChain()
-                
-            processed_audio = chain.process(audio, sr)
-            
-        elif session_type == "guitar":
-            if isinstance(preset, str):
-                chain = GuitarEffectsChain(preset=preset)
-            else:
-                chain = GuitarEffectsChain(custom_board=preset)
-            processed_audio = chain.process(audio, sr)
-            
-            
+        if isinstance(preset, str) and session_type in _STEM_DISPATCH:
+            chain, lock = _get_stem_chain(session_type, preset)
+            with lock:
+                processed_audio = chain(audio, sr)
+
         # Check if preset is a Pedalboard object or callable (Universal support including Bass/Others)
         elif hasattr(preset, "process") or callable(preset) or (Pedalboard and isinstance(preset, Pedalboard)):
              # If it's a Pedalboard object, it is callable: board(audio, sample_rate)
@@ -100,14 +83,350 @@ def process_stem(
 
     # Save
     if processed_audio is not None:
-        # Transpose if needed (C, T) -> (T, C) for saving
-        if processed_audio.ndim == 2 and processed_audio.shape[0] < processed_audio.shape[1]:
-             processed_audio = processed_audio.T
-             
+        # load_audio/effects/save_audio all use (C, T), so no transpose is needed
         save_audio(processed_audio, output_path, sr=sr)
         print(f"V Saved processed stem to {output_path}")
 
 
+def _is_custom_board(preset: object) -> bool:
+    """프리셋이 이름(str)이 아니라 ``pedalboard.Pedalboard`` 등 호출 가능한 처리 체인인지 여부."""
+    return (Pedalboard is not None and isinstance(preset, Pedalboard)) or (
+        callable(preset) and not isinstance(preset, str)
+    )
+
+
+# 신디사이저/피아노 프리셋 이름 -> SynthEffectsChain 파라미터 (목록에 없으면 기본값)
+SYNTH_PRESET_PARAMS = {
+    "bright": {"eq_mid_gain_db": 3.0, "eq_high_gain_db": 2.5, "chorus_mix": 0.4},
+    "warm": {"eq_low_gain_db": 1.5, "eq_mid_gain_db": 1.0, "eq_high_gain_db": -1.0},
+}
+
+
+def _make_vocal_chain(preset: str) -> Callable[..., np.ndarray]:
+    rack = VocalRack(preset=preset)
+    return lambda audio, sr, reset=True: rack.process(audio, sr, reset=reset, channels_first=True)
+
+
+def _make_synth_chain(preset: str) -> Callable[..., np.ndarray]:
+    chain = SynthEffectsChain(**SYNTH_PRESET_PARAMS.get(preset, {}))
+    return lambda audio, sr, reset=True: chain.process(audio, sr, reset=reset, channels_first=True)
+
+
+def _make_guitar_chain(preset: str) -> Callable[..., np.ndarray]:
+    chain = GuitarEffectsChain(preset=preset)
+    # 파이프라인의 오디오는 항상 (C, T)이므로 shape 추측을 건너뜀
+    return lambda audio, sr, reset=True: chain.process(audio, sr, reset=reset, channels_first=True)
+
+
+def _make_bass_chain(preset: str) -> Callable[..., np.ndarray]:
+    rack = BassRack(preset=preset)
+    return lambda audio, sr, reset=True: rack.process(audio, sr, reset=reset, channels_first=True)
+
+
+# 스템 이름 -> (출력용 이름, 프리셋 이름으로 처리 함수 ``(audio, sr, reset=True) -> audio``를 만드는 factory)
+_STEM_DISPATCH = {
+    "vocals": ("Vocals", _make_vocal_chain),
+    "piano": ("Synth/Piano", _make_synth_chain),
+    "guitar": ("Guitar", _make_guitar_chain),
+    "bass": ("Bass", _make_bass_chain),
+}
+
+# (스템 이름, 프리셋 이름) -> (처리 함수, Lock). 같은 프리셋으로 다시 실행하면 체인 생성을 건너뜀
+_chain_cache: Dict[tuple, tuple] = {}
+_chain_cache_lock = threading.Lock()
+
+
+def _get_stem_chain(stem_name: str, preset: str) -> tuple:
+    """
+    스템과 프리셋 이름에 맞는 이펙트 체인을 반환함. 처음 요청될 때만 만들고 이후에는 재사용함.
+    
+    Pedalboard 플러그인은 스레드 안전하지 않으므로, 체인은 함께 반환되는 Lock을 잡은 상태에서만 실행해야 함.
+    (각 체인은 처리 전에 이펙트 상태를 리셋하므로 호출 간에 잔향 등이 이어지지 않음)
+    
+    :return: (처리 함수 ``(audio, sr) -> audio``, threading.Lock)
+    """
+    key = (stem_name, preset)
+    with _chain_cache_lock:
+        entry = _chain_cache.get(key)
+        if entry is None:
+            entry = _chain_cache[key] = (_STEM_DISPATCH[stem_name][1](preset), threading.Lock())
+    return entry
+
+
+def _process_stem_audio(
+    stem_name: str,
+    stem_audio: np.ndarray,
+    sr: int,
+    preset: Union[str, object]
+) -> Optional[np.ndarray]:
+    """
+    분리된 스템 하나에 해당 세션의 이펙트 체인을 적용함 (`run_pipeline`에서 스템별로 호출).
+    
+    :param stem_name: 스템 이름 ('vocals', 'piano', 'guitar', 'bass')
+    :param stem_audio: (C, T) 스템 오디오
+    :param sr: 샘플 레이트
+    :param preset: 프리셋 이름(str) 또는 ``pedalboard.Pedalboard`` 등 호출 가능한 커스텀 체인
+    :return: 처리된 (C, T) 오디오. 이펙트 체인이 없는 스템이면 None
+    """
+    # Custom objects passed from python have priority over string presets logic
+    if _is_custom_board(preset):
+        print(f"  > Processing {stem_name} (Custom Pedalboard)...")
+        return preset(stem_audio, sr)
+
+    entry = _STEM_DISPATCH.get(stem_name)
+    if entry is None:
+        return None
+
+    print(f"  > Processing {entry[0]} (Preset: {preset})...")
+    chain, lock = _get_stem_chain(stem_name, preset)
+    with lock:
+        return chain(stem_audio, sr)
+
+
+# run_pipeline이 저장/처리하는 스템 (나머지 Demucs 스템은 CPU로 가져오지도 않음)
+PIPELINE_STEMS = {"vocals", "guitar", "bass", "piano"}
+
+# 분리 결과 재사용 판단용 메타 파일 (separated/ 디렉토리에 저장)
+SEPARATION_META_NAME = ".sep_meta.json"
+
+# run_pipeline 출력 포맷 -> soundfile subtype (FLAC은 무손실 압축, OGG는 Vorbis 손실 압축)
+OUTPUT_FORMATS = {"wav": "PCM_16", "flac": "PCM_16", "ogg": "VORBIS"}
+# 손실 압축 subtype. 이 포맷으로 저장한 스템은 분리 결과와 달라지므로 재사용하지 않음
+LOSSY_SUBTYPES = {"VORBIS"}
+
+# CUDA에서 한 번의 forward로 묶어 실행할 Demucs segment 수 (DemucsSeparator.segment_batch)
+GPU_SEGMENT_BATCH = 4
+
+# run_pipeline 호출 간에 재사용하는 DemucsSeparator. 모델 가중치는 이미 프로세스 전체에서 공유되지만
+# Separator의 CUDA pinned 스테이징 버퍼는 동시에 쓰면 안 되므로 스레드별로 캐시함
+_separator_cache = threading.local()
+
+
+def _get_separator(device: str, segment_batch: int, precision: str = "auto") -> DemucsSeparator:
+    """현재 스레드에서 (device, segment_batch, precision)으로 만든 DemucsSeparator를 반환하고, 없으면 생성함."""
+    separators = getattr(_separator_cache, "separators", None)
+    if separators is None:
+        separators = _separator_cache.separators = {}
+    
+    key = (device, segment_batch, precision)
+    separator = separators.get(key)
+    if separator is None:
+        separator = separators[key] = DemucsSeparator(
+            device=device, segment_batch=segment_batch, precision=precision
+        )
+    return separator
+
+
+def _source_signature(input_path: Path) -> Dict[str, object]:
+    """입력 파일이 바뀌었는지 판단하기 위한 서명(경로, 수정 시각, 크기)을 반환함."""
+    stat = input_path.stat()
+    return {
+        "source": str(input_path.resolve()),
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+    }
+
+
+def _separation_settings(device: str, use_autocast: bool, segment: Optional[float]) -> Dict[str, object]:
+    """
+    분리 결과에 영향을 주는 설정을 반환함 (재사용 판단용 메타에 기록).
+    CPU는 use_autocast와 무관하게 항상 FP32로 실행하므로 정밀도를 "fp32"로 기록함.
+    """
+    use_autocast = use_autocast and not device.startswith("cpu")
+    return {
+        "precision": "auto" if use_autocast else "fp32",
+        "segment": segment,
+    }
+
+
+def _load_cached_stems(
+    input_path: Path,
+    separated_dir: Path,
+    output_format: str = "wav",
+    settings: Optional[Dict[str, object]] = None
+) -> Optional[Tuple[Dict[str, np.ndarray], int]]:
+    """
+    이전 실행에서 저장한 분리 스템을 재사용할 수 있으면 (C, T) 배열로 로드하여 반환함.
+    
+    메타 파일의 입력 서명, 저장 포맷/subtype, 분리 설정이 현재 실행과 일치하고 스템 파일이 모두 남아 있을 때만
+    재사용하며, 그 외에는 None을 반환하여 분리를 다시 수행하게 함. 손실 압축(ogg)으로 저장한 스템은
+    분리 결과와 달라지므로 재사용하지 않음 (wav/flac은 16bit PCM으로 양자화된 스템을 재사용함).
+    
+    :param input_path: 입력 믹스 파일 경로
+    :param separated_dir: 분리 스템이 저장된 디렉토리
+    :param output_format: 스템 파일 포맷. 이전 실행과 포맷이 다르면 재사용하지 않음
+    :param settings: 현재 실행의 분리 설정 (`_separation_settings`). 이전 실행과 다르면 재사용하지 않음
+    :return: (스템 딕셔너리, 메타에 기록된 분리 샘플레이트) 또는 None
+    """
+    subtype = OUTPUT_FORMATS[output_format]
+    if subtype in LOSSY_SUBTYPES:
+        return None
+    
+    meta_path = separated_dir / SEPARATION_META_NAME
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if meta.get("signature") != _source_signature(input_path):
+        return None
+    if meta.get("format") != output_format or meta.get("subtype") != subtype:
+        return None
+    if meta.get("settings") != (settings or {}):
+        return None
+    sr = meta.get("sample_rate")
+    if not isinstance(sr, int):
+        return None
+    
+    stems = {}
+    for stem_name in meta.get("stems", []):
+        stem_path = separated_dir / f"{stem_name}.{output_format}"
+        if not stem_path.exists():
+            return None
+        stems[stem_name], _ = load_audio(stem_path, sr=sr)
+    
+    return (stems, sr) if stems else None
+
+
+def _save_separation_meta(
+    input_path: Path,
+    separated_dir: Path,
+    sr: int,
+    stem_names,
+    output_format: str = "wav",
+    settings: Optional[Dict[str, object]] = None
+) -> None:
+    """분리 스템 저장이 끝난 뒤 재사용 판단용 메타 파일을 기록함."""
+    meta = {
+        "signature": _source_signature(input_path),
+        "sample_rate": sr,
+        "format": output_format,
+        "subtype": OUTPUT_FORMATS[output_format],
+        "settings": settings or {},
+        "stems": sorted(stem_names),
+    }
+    with open(separated_dir / SEPARATION_META_NAME, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _invalidate_separation_meta(separated_dir: Path) -> None:
+    """
+    분리 스템을 다시 쓰기 전에 메타 파일을 지움. 쓰는 도중 실행이 실패해도 다음 실행이
+    일부만 새로 쓰인 스템을 재사용하지 않도록 함 (메타는 모든 저장이 끝난 뒤 다시 기록됨).
+    """
+    (separated_dir / SEPARATION_META_NAME).unlink(missing_ok=True)
+
+
+def _run_pipeline_streaming(
+    input_path: Path,
+    separator: DemucsSeparator,
+    separated_dir: Path,
+    processed_dir: Path,
+    presets: Dict[str, Union[str, object]],
+    board_locks: Dict[int, threading.Lock],
+    segment: float,
+    save_raw: bool = True,
+    save_processed: bool = True,
+    output_format: str = "wav"
+) -> tuple:
+    """
+    `run_pipeline(segment=...)`의 스트리밍 경로. 입력 파일을 segment 단위로 분리하고(`separate_stream`),
+    segment마다 원본 스템을 파일에 이어 쓰고 이펙트를 상태를 유지한 채(reset=False) 적용하여 이어 씀.
+    
+    스템별 작업은 스레드에서 실행되며, 다음 segment를 분리하는 동안 이전 segment의 저장/이펙트가 진행됨.
+    같은 스템의 segment들은 항상 순서대로 처리됨.
+    
+    :return: (저장된 파일 경로 딕셔너리, 스템 이름 리스트)
+    """
+    sr = separator.sample_rate
+    subtype = OUTPUT_FORMATS[output_format]
+    keep = [name for name in separator.model.sources if name in PIPELINE_STEMS]
+
+    # 스트림 동안 상태가 이어져야 하므로 캐시된(공유) 체인 대신 이번 실행 전용 체인을 만듦
+    processors = {}
+    for stem_name in keep if save_processed else []:
+        preset = presets.get(stem_name)
+        if _is_custom_board(preset):
+            print(f"  > Processing {stem_name} (Custom Pedalboard)...")
+            if Pedalboard is not None and isinstance(preset, Pedalboard):
+                processors[stem_name] = preset
+            else:
+                # reset 인자를 받지 않는 일반 callable
+                processors[stem_name] = lambda audio, sr, reset=True, fn=preset: fn(audio, sr)
+        else:
+            display_name, make_chain = _STEM_DISPATCH[stem_name]
+            print(f"  > Processing {display_name} (Preset: {preset})...")
+            processors[stem_name] = make_chain(preset)
+
+    stem_names = []
+    raw_writers = {}
+    processed_writers = {}
+    failed = set()
+
+    def process_segment(stem_name: str, stem_audio: np.ndarray, first: bool) -> None:
+        if save_raw:
+            raw_writers[stem_name].write(stem_audio)
+        if not save_processed or stem_name in failed:
+            return
+        lock = board_locks.get(id(presets.get(stem_name)))
+        try:
+            with lock if lock is not None else nullcontext():
+                processed_audio = processors[stem_name](stem_audio, sr, reset=first)
+        except Exception as e:
+            print(f"  ✗ Processing failed for {stem_name}: {e}")
+            failed.add(stem_name)
+            return
+        processed_writers[stem_name].write(processed_audio)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, len(keep))) as executor:
+            pending = {}
+            for index, segment_stems in enumerate(separator.separate_stream(str(input_path), segment=segment, keep=keep)):
+                print(f"  - Segment {index + 1} ({segment:.0f}s)")
+                if index == 0:
+                    stem_names = list(segment_stems)
+                    for stem_name, stem_audio in segment_stems.items():
+                        channels = stem_audio.shape[0]
+                        if save_raw:
+                            raw_writers[stem_name] = AudioWriter(
+                                separated_dir / f"{stem_name}.{output_format}", sr=sr, channels=channels, subtype=subtype
+                            )
+                        if save_processed:
+                            processed_writers[stem_name] = AudioWriter(
+                                processed_dir / f"{stem_name}_processed.{output_format}",
+                                sr=sr, channels=channels, subtype=subtype
+                            )
+                for stem_name, stem_audio in segment_stems.items():
+                    # 같은 스템의 이전 segment가 끝난 뒤에 다음 segment를 넘김 (쓰기/이펙트 상태 순서 유지)
+                    if stem_name in pending:
+                        pending[stem_name].result()
+                    pending[stem_name] = executor.submit(process_segment, stem_name, stem_audio, index == 0)
+                del segment_stems
+            for future in pending.values():
+                future.result()
+    finally:
+        for writer in list(raw_writers.values()) + list(processed_writers.values()):
+            writer.close()
+
+    saved_files = {}
+    for stem_name in stem_names:
+        if save_raw:
+            saved_files[f"{stem_name}_raw"] = str(separated_dir / f"{stem_name}.{output_format}")
+            print(f"  ✓ Saved raw {stem_name}")
+        if not save_processed:
+            continue
+        proc_save_path = processed_dir / f"{stem_name}_processed.{output_format}"
+        if stem_name in failed:
+            # 중간에 실패한 스템의 불완전한 결과는 남기지 않음
+            proc_save_path.unlink(missing_ok=True)
+        else:
+            saved_files[f"{stem_name}_processed"] = str(proc_save_path)
+            print(f"  ✓ Saved processed {stem_name}")
+
+    return saved_files, stem_names
+
+
 def run_pipeline(
     input_path: str,
     device: Optional[str] = None,
@@ -115,7 +434,14 @@ def run_pipeline(
     vocal_preset: str = "default",
     synth_preset: str = "default",
     guitar_preset: Union[str, object] = "clean",
-    bass_preset: str = "default"
+    bass_preset: str = "default",
+    reuse_separated: bool = True,
+    reuse_separator: bool = True,
+    use_autocast: bool = True,
+    segment: Optional[float] = None,
+    save_raw: bool = True,
+    save_processed: bool = True,
+    output_format: str = "wav"
 ) -> Dict[str, str]:
     """
     전체 오디오 처리 파이프라인을 실행함 (Master Pipeline).
@@ -125,21 +451,47 @@ def run_pipeline(
     3. 각 스템에 대해 설정된 프리셋을 사용하여 이펙트를 적용함 (In-Memory).
     4. 이펙트가 적용된 스템(Processed Stems)을 저장함.
     
+    같은 입력 파일로 다시 실행하면(프리셋 튜닝 등) `separated/`에 저장된 원본 스템을 재사용하여
+    모델 로드와 분리 단계를 건너뜀. 입력 파일의 수정 시각이나 크기, 저장 포맷, 분리 설정(use_autocast,
+    segment)이 바뀌면 다시 분리함. 재사용한 스템은 16bit PCM으로 저장된 값이며, ogg(손실 압축)로
+    저장하는 경우에는 재사용하지 않음.
+    
     :param input_path: 입력 오디오 파일 경로 (믹스 파일)
-    :param device: 연산 장치 ('cuda' 또는 'cpu'). None일 경우 자동 감지.
+    :param device: 연산 장치 ('cuda', 'mps' 또는 'cpu'). None일 경우 자동 감지.
     :param output_dir: 결과 파일을 저장할 디렉토리 경로
     :param vocal_preset: 보컬 이펙트 프리셋 이름 또는 ``pedalboard.Pedalboard`` 객체
     :param synth_preset: 신디사이저/피아노 이펙트 프리셋 이름 또는 ``pedalboard.Pedalboard`` 객체
     :param guitar_preset: 기타 이펙트 프리셋 이름 또는 ``pedalboard.Pedalboard`` 객체
     :param bass_preset: 베이스 이펙트 프리셋 이름 또는 ``pedalboard.Pedalboard`` 객체
+    :param reuse_separated: 이전 실행의 분리 스템이 유효하면 재사용할지 여부 (기본값: True)
+    :param reuse_separator: 이전 호출에서 만든 DemucsSeparator를 재사용할지 여부 (기본값: True).
+        False이면 매번 새로 생성함 (테스트 등)
+    :param use_autocast: GPU에서 Demucs를 reduced precision(BF16, 미지원 시 FP16; MPS는 FP16)으로
+        실행할지 여부 (기본값: True). False이면 FP32로 실행함. CPU는 항상 FP32
+    :param segment: 지정하면 입력 파일을 전부 읽지 않고 segment(초) 단위로 읽어 분리하고, 각 segment의
+        스템을 곧바로 저장/이펙트 처리함 (기본값: None = 파일 전체를 한 번에 처리).
+        메모리 사용량이 곡 길이와 무관해지므로 긴 녹음에 사용. segment 경계는 앞뒤 1초 문맥과 함께 분리하며,
+        이펙트는 segment 사이에 상태를 유지함. 단, 같은 커스텀 보드 객체를 여러 스템에 쓰면 스템 간에 상태가 이어짐
+    :param save_raw: 분리된 원본 스템을 `separated/`에 저장할지 여부 (기본값: True).
+        False이면 원본 스템을 쓰지 않으며, 다음 실행에서 재사용할 분리 결과도 남지 않음
+    :param save_processed: 이펙트를 적용한 스템을 `processed/`에 저장할지 여부 (기본값: True).
+        False이면 이펙트 처리 자체를 건너뜀 (분리만 수행)
+    :param output_format: 저장 포맷 ('wav', 'flac', 'ogg'; 기본값: 'wav').
+        'flac'은 16-bit 무손실 압축으로 디스크 쓰기량을 줄이고, 'ogg'는 Vorbis 손실 압축임
     
     :return: 저장된 파일 경로들의 딕셔너리 (Key: 식별자, Value: 파일 경로)
     :raises FileNotFoundError: 입력 파일이 없을 경우
+    :raises ValueError: 지원하지 않는 output_format이거나 save_raw/save_processed가 모두 False일 경우
     :raises RuntimeError: 오디오 로드, 분리, 또는 처리 중 오류 발생 시
     """
     input_path = Path(input_path)
     if not input_path.exists():
         raise FileNotFoundError(f"Input file not found: {input_path}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output_format: {output_format!r} (choose from {sorted(OUTPUT_FORMATS)})")
+    if not (save_raw or save_processed):
+        raise ValueError("Nothing to save: save_raw and save_processed are both False")
+    subtype = OUTPUT_FORMATS[output_format]
 
     output_dir = Path(output_dir)
     separated_dir = output_dir / "separated"
@@ -149,32 +501,93 @@ def run_pipeline(
 
     print(f"> Starting Pipeline for: {input_path.name}")
 
-    # 1. Initialize
-    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
-    print(f"- Device: {device}")
+    presets = {
+        "vocals": vocal_preset,
+        "piano": synth_preset,
+        "guitar": guitar_preset,
+        "bass": bass_preset,
+    }
+    # 같은 커스텀 보드 객체를 여러 스템에 넘긴 경우, 플러그인 상태가 섞이지 않도록 동시에 실행하지 않음
+    board_locks = {id(p): threading.Lock() for p in presets.values() if _is_custom_board(p)}
 
-    try:
-        separator = DemucsSeparator(device=device)
-    except Exception as e:
-        raise RuntimeError(f"Failed to initialize DemucsSeparator: {e}")
+    device = device or default_device()
+    settings = _separation_settings(device, use_autocast, segment)
 
-    # 2. Load Audio
-    print("- Loading audio...")
-    try:
-        audio, sr = load_audio(input_path, sr=separator.sample_rate)
-    except Exception as e:
-        raise RuntimeError(f"Failed to load audio: {e}")
+    # 0. Reuse previous separation (skips model load + separation entirely)
+    cached = None
+    if reuse_separated:
+        cached = _load_cached_stems(input_path, separated_dir, output_format, settings)
+    
+    reused = cached is not None
+    if reused:
+        print(f"- Reusing separated stems from: {separated_dir}")
+        stems, sr = cached
+    else:
+        if save_raw:
+            _invalidate_separation_meta(separated_dir)
 
-    # 3. Separation
-    print("- Separating stems...")
-    try:
-        stems = separator.separate_memory(audio, shifts=0)
-    except Exception as e:
-        raise RuntimeError(f"Separation failed: {e}")
+        # 1. Initialize
+        print(f"- Device: {device}")
+
+        try:
+            # GPU에서는 겹치는 segment들을 배치로 묶어 한 번에 분리 (CPU는 이득이 없어 기본값 유지)
+            segment_batch = GPU_SEGMENT_BATCH if device.startswith("cuda") else 1
+            precision = "auto" if use_autocast else "fp32"
+            if reuse_separator:
+                separator = _get_separator(device, segment_batch, precision)
+            else:
+                separator = DemucsSeparator(device=device, segment_batch=segment_batch, precision=precision)
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize DemucsSeparator: {e}")
+
+        if segment is not None:
+            # 2-4. 파일을 segment 단위로 읽어 분리하고, 각 segment를 바로 저장/이펙트 처리함
+            try:
+                saved_files, stem_names = _run_pipeline_streaming(
+                    input_path, separator, separated_dir, processed_dir, presets, board_locks, segment,
+                    save_raw=save_raw, save_processed=save_processed, output_format=output_format
+                )
+            except Exception as e:
+                raise RuntimeError(f"Streaming separation failed: {e}")
+            if save_raw:
+                _save_separation_meta(
+                    input_path, separated_dir, separator.sample_rate, stem_names, output_format, settings
+                )
+            print("Pipeline Completed.")
+            return saved_files
+
+        # 2. Load Audio
+        print("- Loading audio...")
+        try:
+            if device.startswith("cuda"):
+                # 원본 샘플레이트 그대로 (C, T) float32로 읽고, 리샘플링은 GPU에서 수행 (separate_file과 동일)
+                audio, input_sr = load_audio(input_path, sr=None)
+            else:
+                audio, input_sr = load_audio(input_path, sr=separator.sample_rate)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load audio: {e}")
+
+        # 3. Separation
+        print("- Separating stems...")
+        try:
+            # 사용할 스템만 장치에서 CPU로 복사 (drums/other는 전송하지 않음)
+            keep = [name for name in separator.model.sources if name in PIPELINE_STEMS]
+            stems = separator.separate_memory(audio, shifts=0, keep=keep, sample_rate=input_sr)
+        except Exception as e:
+            raise RuntimeError(f"Separation failed: {e}")
+        # 분리된 stem은 항상 모델 샘플레이트임
+        sr = separator.sample_rate
+        # 입력 믹스는 더 이상 필요 없으므로 이펙트 단계 전에 해제
+        del audio
 
     # Filter stems
-    allowed_stems = {"vocals", "guitar", "bass", "piano"}
-    stems = {k: v for k, v in stems.items() if k in allowed_stems}
+    # 이후 단계(이펙트, save_audio)는 모두 (C, T) C-contiguous float32를 전제로 하므로 여기서 한 번만 보장함
+    # (separate_memory/load_audio 결과는 이미 이 형태이므로 복사 없이 그대로 통과함)
+    stems = {
+        k: np.ascontiguousarray(v, dtype=np.float32)
+        for k, v in stems.items() if k in PIPELINE_STEMS
+    }
+    stem_names = list(stems)
 
     saved_files = {}
 
@@ -186,102 +599,228 @@ def run_pipeline(
     # or we can use the effect classes directly. 
     # Using effect classes directly is more efficient here since we already have the separated stems.
     
-    from hystemfx.vocal.effects import VocalRack
-    from hystemfx.synth.effects import SynthEffectsChain
-    from hystemfx.guitar.effects import GuitarEffectsChain
-    from hystemfx.bass.effects import BassRack
+    def apply_effects(stem_name: str, stem_audio: np.ndarray) -> Optional[np.ndarray]:
+        preset = presets.get(stem_name)
+        lock = board_locks.get(id(preset))
+        with lock if lock is not None else nullcontext():
+            return _process_stem_audio(stem_name, stem_audio, sr, preset)
 
-    for stem_name, stem_audio in stems.items():
-        # A. Save Raw Stem
-        raw_save_path = separated_dir / f"{stem_name}.wav"
-        
-        stem_to_save = stem_audio
-        if stem_to_save.ndim == 2:
-            stem_to_save = stem_to_save.T
-            
-        save_audio(stem_to_save, raw_save_path, sr=sr)
-        saved_files[f"{stem_name}_raw"] = str(raw_save_path)
-        print(f"  ✓ Saved raw {stem_name}")
-
-        # B. Apply Effects (In-Memory)
-        processed_audio = None
-        
-        try:
-            # Re-evaluating flow for run_pipeline loop:
-            current_preset = None
-            if stem_name == "vocals": current_preset = vocal_preset
-            elif stem_name == "piano": current_preset = synth_preset
-            elif stem_name == "guitar": current_preset = guitar_preset
-            elif stem_name == "bass": current_preset = bass_preset
-
-            # Check if it is a Pedalboard object (or callable processing chain)
-            # We assume custom objects passed from python have priority over string presets logic
-            is_custom_board = (Pedalboard and isinstance(current_preset, Pedalboard)) or (hasattr(current_preset, "__call__") and not isinstance(current_preset, str))
-            
-            if is_custom_board:
-                 print(f"  > Processing {stem_name} (Custom Pedalboard)...")
-                 processed_audio = current_preset(stem_audio, sr)
-            
-            else:
-                # String preset or compatible internal logic
-                if stem_name == "vocals":
-                    print(f"  > Processing Vocals (Preset: {vocal_preset})...")
-                    rack = VocalRack(preset=vocal_preset)
-                    processed_audio = rack.process(stem_audio, sr)
-
-                elif stem_name == "piano":
-                    print(f"  > Processing Synth/Piano (Preset: {synth_preset})...")
-                    # Synth logic matching pipeline
-                    chain_params = {}
-                    if synth_preset == "bright":
-                        chain_params = {"eq_mid_gain_db": 3.0, "eq_high_gain_db": 2.5, "chorus_mix": 0.4}
-                    elif synth_preset == "warm":
-                        chain_params = {"eq_low_gain_db": 1.5, "eq_mid_gain_db": 1.0, "eq_high_gain_db": -1.0}
-                    
-                    chain = SynthEffectsChain(**chain_params)
-                    processed_audio = chain.process(stem_audio, sr)
-
-                elif stem_name == "guitar":
-                    print(f"  > Processing Guitar (Preset: {guitar_preset})...")
-                    # Guitar chain handles both string and board in __init__ but let's be safe
-                    if isinstance(guitar_preset, str):
-                        chain = GuitarEffectsChain(preset=guitar_preset)
-                    else:
-                        chain = GuitarEffectsChain(custom_board=guitar_preset)
-                    processed_audio = chain.process(stem_audio, sr)
-                
-                elif stem_name == "bass":
-                    print(f"  > Processing Bass (Preset: {bass_preset})...")
-                    rack = BassRack(preset=bass_preset)
-                    processed_audio = rack.process(stem_audio, sr)
-                
-        except Exception as e:
-            print(f"  ✗ Processing failed for {stem_name}: {e}")
+    # 스템별 이펙트 체인은 서로 독립적이고 Pedalboard/soundfile은 처리 중 GIL을 해제하므로
+    # 원본 저장과 이펙트 처리를 스레드로 동시에 실행함 (결과 수집/출력은 스템 순서대로)
+    num_workers = max(1, min(len(stems), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        raw_saves = {}
+        effects = {}
+        for stem_name, stem_audio in stems.items():
+            # A. Save Raw Stem (재사용한 경우 이미 디스크에 있으므로 생략)
+            if save_raw:
+                raw_save_path = separated_dir / f"{stem_name}.{output_format}"
+                if not reused:
+                    raw_saves[stem_name] = executor.submit(
+                        save_audio, stem_audio, raw_save_path, sr=sr, subtype=subtype
+                    )
+                saved_files[f"{stem_name}_raw"] = str(raw_save_path)
 
-        # C. Save Processed Stem
-        if processed_audio is not None:
-            proc_save_path = processed_dir / f"{stem_name}_processed.wav"
-            
-            proc_to_save = processed_audio
-            if proc_to_save.ndim == 2 and proc_to_save.shape[0] < proc_to_save.shape[1]:
-                 proc_to_save = proc_to_save.T
-            
-            save_audio(proc_to_save, proc_save_path, sr=sr)
-            saved_files[f"{stem_name}_processed"] = str(proc_save_path)
-            print(f"  ✓ Saved processed {stem_name}")
+            # B. Apply Effects (In-Memory)
+            if save_processed:
+                effects[stem_name] = executor.submit(apply_effects, stem_name, stem_audio)
+
+        # 제출한 작업만 스템 배열을 참조하게 하여, 저장/처리가 끝난 스템부터 메모리에서 해제되도록 함
+        stems.clear()
+        stem_audio = None
+
+        processed_saves = {}
+        for stem_name in stem_names if save_processed else []:
+            try:
+                # future를 꺼내 버려서 처리 결과는 저장 작업만 참조하도록 함 (저장 후 바로 해제)
+                processed_audio = effects.pop(stem_name).result()
+            except Exception as e:
+                print(f"  ✗ Processing failed for {stem_name}: {e}")
+                processed_audio = None
+
+            # C. Save Processed Stem (쓰기도 워커에 넘겨 남은 스템의 처리와 겹치게 함)
+            if processed_audio is not None:
+                proc_save_path = processed_dir / f"{stem_name}_processed.{output_format}"
+                processed_saves[stem_name] = executor.submit(
+                    save_audio, processed_audio, proc_save_path, sr=sr, subtype=subtype
+                )
+                saved_files[f"{stem_name}_processed"] = str(proc_save_path)
+            del processed_audio
+
+        # 모든 쓰기가 끝날 때까지 기다림 (쓰기 오류는 여기서 그대로 전달됨)
+        for stem_name in stem_names:
+            if stem_name in raw_saves:
+                raw_saves[stem_name].result()
+                print(f"  ✓ Saved raw {stem_name}")
+            if stem_name in processed_saves:
+                processed_saves[stem_name].result()
+                print(f"  ✓ Saved processed {stem_name}")
+
+    if save_raw and not reused:
+        _save_separation_meta(input_path, separated_dir, sr, stem_names, output_format, settings)
 
     print("Pipeline Completed.")
     return saved_files
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python pipeline.py <input_audio_path> [output_dir]")
-        sys.exit(1)
+# 디렉토리 입력 시 처리할 오디오 확장자
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".ogg", ".aif", ".aiff", ".m4a")
+
+
+def collect_inputs(pattern: Union[str, Path]) -> List[Path]:
+    """
+    CLI 입력 인자를 오디오 파일 목록으로 변환함.
+    
+    :param pattern: 파일 경로, 디렉토리(안의 오디오 파일 전체) 또는 glob 패턴 (예: ``"songs/*.mp3"``)
+    :return: 정렬된 파일 경로 리스트 (일치하는 파일이 없으면 빈 리스트)
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted(p for p in path.iterdir() if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS)
+    if any(ch in str(pattern) for ch in "*?["):
+        anchor = Path(path.anchor) if path.is_absolute() else Path(".")
+        rel = str(path.relative_to(anchor)) if path.is_absolute() else str(pattern)
+        return sorted(p for p in anchor.glob(rel) if p.is_file())
+    return [path]
+
 
-    in_path = sys.argv[1]
-    out_dir = sys.argv[2] if len(sys.argv) > 2 else "output"
+def _batch_output_names(paths: List[str]) -> List[str]:
+    """
+    run_pipeline_batch의 파일별 출력 디렉토리 이름을 만듦.
     
+    기본은 파일 이름(확장자 제외)이지만, 이름이 같은 파일(``a.wav``와 ``a.mp3``, ``x/a.wav``와
+    ``y/a.wav``)이 같은 디렉토리에 스템과 ``.sep_meta.json``을 덮어쓰지 않도록, 겹치는 이름에는
+    확장자를 붙이고(``a_wav``) 그래도 겹치면 번호를 붙임(``a_wav_2``).
+    
+    :param paths: 입력 파일 경로 리스트 (중복 없음)
+    :return: paths와 같은 순서의 디렉토리 이름 리스트 (모두 서로 다름)
+    """
+    stems = [Path(p).stem for p in paths]
+    names = []
+    used = set()
+    for p, stem in zip(paths, stems):
+        name = stem
+        if stems.count(stem) > 1:
+            name = f"{stem}_{Path(p).suffix.lstrip('.').lower()}"
+        base, n = name, 2
+        while name in used:
+            name = f"{base}_{n}"
+            n += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _init_batch_worker(slots, num_threads: int) -> None:
+    """
+    run_pipeline_batch 워커 프로세스 초기화 함수.
+    큐에서 GPU 번호를 하나 꺼내 CUDA_VISIBLE_DEVICES로 지정함 (CUDA 초기화 전에 실행되어야 함).
+    None이면 CPU 슬롯으로, 코어를 워커 수만큼 나눠 씀.
+    """
+    device_id = slots.get()
+    if device_id is not None:
+        os.environ["CUDA_VISIBLE_DEVICES"] = str(device_id)
+    else:
+        torch.set_num_threads(num_threads)
+
+
+def _run_batch_job(input_path: str, output_dir: str, kwargs: dict) -> Union[Dict[str, str], str]:
+    """
+    워커에서 파일 하나를 처리함. 한 파일의 실패가 배치 전체를 멈추지 않도록 오류는 메시지로 반환함.
+    """
     try:
-        run_pipeline(in_path, output_dir=out_dir)
+        return run_pipeline(input_path, output_dir=output_dir, **kwargs)
     except Exception as e:
-        print(f"Error: {e}")
+        print(f"Error ({Path(input_path).name}): {e}")
+        return f"Error: {e}"
+
+
+def run_pipeline_batch(
+    input_paths: List[Union[str, Path]],
+    output_dir: Union[str, Path] = "output",
+    num_workers: Optional[int] = None,
+    **kwargs
+) -> Dict[str, Union[Dict[str, str], str]]:
+    """
+    여러 파일에 run_pipeline을 실행함. 각 결과는 ``output_dir/<파일 이름>/``에 저장됨.
+    파일 이름이 겹치는 입력은 ``<파일 이름>_<확장자>``(그래도 겹치면 뒤에 번호)로 구분하고,
+    같은 경로가 여러 번 주어지면 한 번만 처리함.
+    
+    CUDA에서는 GPU마다 워커 프로세스를 하나씩 띄우고 각 워커에 서로 다른 ``CUDA_VISIBLE_DEVICES``를
+    지정하여 파일들을 GPU 수만큼 병렬로 분리함. 워커가 GPU보다 많으면 GPU를 번갈아 배정함.
+    CPU에서는 기본적으로 한 프로세스에서 순서대로 처리하며(PyTorch가 이미 모든 코어를 사용),
+    ``num_workers``를 지정하면 코어를 나눠 가진 워커들로 병렬 처리함.
+    워커 하나일 때는 현재 프로세스에서 실행하므로 캐시된 분리 모델을 그대로 재사용함.
+    
+    :param input_paths: 입력 오디오 파일 경로 리스트
+    :param output_dir: 결과를 저장할 상위 디렉토리
+    :param num_workers: 워커 프로세스 수 (None이면 CUDA는 GPU 수, 그 외는 1)
+    :param kwargs: run_pipeline에 그대로 전달할 인자 (device, 프리셋 등)
+    :return: {입력 경로: run_pipeline 결과 딕셔너리 또는 "Error: ..." 메시지}
+    """
+    output_dir = Path(output_dir)
+    paths = list(dict.fromkeys(str(p) for p in input_paths))
+    names = _batch_output_names(paths)
+    for p, name in zip(paths, names):
+        if name != Path(p).stem:
+            print(f"- Duplicate file name: {p} -> {output_dir / name}")
+    jobs = [(p, str(output_dir / name), kwargs) for p, name in zip(paths, names)]
+    
+    device = kwargs.get("device") or default_device()
+    num_gpus = torch.cuda.device_count() if device.startswith("cuda") else 0
+    if num_workers is None:
+        num_workers = num_gpus or 1
+    num_workers = max(1, min(num_workers, len(jobs)))
+    
+    if num_workers == 1:
+        return {p: _run_batch_job(*job) for p, job in zip(paths, jobs)}
+    
+    # fork 후에는 CUDA를 쓸 수 없으므로 spawn으로 새 인터프리터를 띄움
+    ctx = mp.get_context("spawn")
+    slots = ctx.Queue()
+    if num_gpus:
+        # 워커 안에서는 보이는 GPU가 하나뿐이므로 장치 번호 없이 "cuda"를 사용
+        kwargs = dict(kwargs, device="cuda")
+        jobs = [(p, out, kwargs) for p, out, _ in jobs]
+        for i in range(num_workers):
+            slots.put(i % num_gpus)
+    else:
+        for _ in range(num_workers):
+            slots.put(None)
+    num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+    
+    print(f"> Running {len(jobs)} files on {num_workers} workers" + (f" ({num_gpus} GPUs)" if num_gpus else ""))
+    with ctx.Pool(num_workers, initializer=_init_batch_worker, initargs=(slots, num_threads)) as pool:
+        results = pool.starmap(_run_batch_job, jobs, chunksize=1)
+    return dict(zip(paths, results))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HystemFX: 스템 분리 + 세션별 이펙트 파이프라인")
+    parser.add_argument("input", help="입력 오디오 파일, 디렉토리 또는 glob 패턴")
+    parser.add_argument("output_dir", nargs="?", default="output", help="출력 디렉토리 (기본값: output)")
+    parser.add_argument("--no-raw", action="store_true", help="분리된 원본 스템을 저장하지 않음")
+    parser.add_argument("--no-processed", action="store_true", help="이펙트 처리/저장을 건너뜀")
+    parser.add_argument("--format", choices=sorted(OUTPUT_FORMATS), default="wav", help="저장 포맷 (기본값: wav)")
+    args = parser.parse_args()
+
+    in_paths = collect_inputs(args.input)
+    out_dir = args.output_dir
+    options = {
+        "save_raw": not args.no_raw,
+        "save_processed": not args.no_processed,
+        "output_format": args.format,
+    }
+    
+    if not in_paths:
+        print(f"Error: no audio files found for: {args.input}")
+        sys.exit(1)
+    
+    if len(in_paths) == 1 and not Path(args.input).is_dir():
+        try:
+            run_pipeline(in_paths[0], output_dir=out_dir, **options)
+        except Exception as e:
+            print(f"Error: {e}")
+    else:
+        run_pipeline_batch(in_paths, output_dir=out_dir, **options)
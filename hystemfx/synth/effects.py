@@ -6,10 +6,95 @@ Pedalboard를 사용하여 신디사이저/피아노/키보드 사운드에
 최적화된 이펙트 체인을 적용합니다.
 """
 
+import os
+import threading
+import warnings
 import numpy as np
-from typing import Optional, Dict, Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Sequence, Union, Tuple
 from pathlib import Path
-import random
+
+try:
+    from pedalboard import (
+        Pedalboard, Compressor, Gain, Chorus, Reverb, 
+        Limiter, HighpassFilter, LowShelfFilter, 
+        HighShelfFilter, PeakFilter
+    )
+except ImportError:
+    Pedalboard = None
+
+
+# 파라미터 이름 -> (플러그인 속성 이름, 플러그인 파라미터 이름)
+# update_params는 보드를 다시 만들지 않고 해당 플러그인의 값만 바꿉니다.
+_PARAM_TARGETS = {
+    'gate_threshold_db': ('_gate', 'threshold_db'),
+    'gate_ratio': ('_gate', 'ratio'),
+    'gate_attack_ms': ('_gate', 'attack_ms'),
+    'gate_release_ms': ('_gate', 'release_ms'),
+    'highpass_cutoff_hz': ('_highpass', 'cutoff_frequency_hz'),
+    'comp_threshold_db': ('_comp', 'threshold_db'),
+    'comp_ratio': ('_comp', 'ratio'),
+    'comp_attack_ms': ('_comp', 'attack_ms'),
+    'comp_release_ms': ('_comp', 'release_ms'),
+    'eq_low_gain_db': ('_eq_low', 'gain_db'),
+    'eq_mid_gain_db': ('_eq_mid', 'gain_db'),
+    'eq_high_gain_db': ('_eq_high', 'gain_db'),
+    'chorus_rate_hz': ('_chorus', 'rate_hz'),
+    'chorus_depth': ('_chorus', 'depth'),
+    'chorus_centre_delay_ms': ('_chorus', 'centre_delay_ms'),
+    'chorus_feedback': ('_chorus', 'feedback'),
+    'chorus_mix': ('_chorus', 'mix'),
+    'reverb_room_size': ('_reverb', 'room_size'),
+    'reverb_damping': ('_reverb', 'damping'),
+    'reverb_wet_level': ('_reverb', 'wet_level'),
+    'reverb_dry_level': ('_reverb', 'dry_level'),
+    'reverb_width': ('_reverb', 'width'),
+    'limiter_threshold_db': ('_limiter', 'threshold_db'),
+    'limiter_release_ms': ('_limiter', 'release_ms'),
+}
+
+# 보드에 넣는 플러그인 속성 이름 (이펙트 순서)
+_STAGES = (
+    '_gate', '_highpass', '_comp',
+    '_eq_low', '_eq_mid', '_eq_high',
+    '_chorus', '_reverb', '_limiter',
+)
+
+# 값이 0이면 출력이 입력과 같아지는 스테이지: 플러그인 속성 이름 -> 파라미터 이름
+# |값| <= _BYPASS_TOLERANCE 이면 보드에서 빼서 계산을 건너뜀
+# (0dB 셸프/피크 필터와 mix 0의 코러스는 Pedalboard에서 입력을 그대로 돌려줌.
+#  wet 0의 리버브는 dry 레벨만큼 게인이 걸리고, 게이트는 threshold와 무관하게 동작하므로 제외)
+_BYPASS_PARAMS = {
+    '_eq_low': 'eq_low_gain_db',
+    '_eq_mid': 'eq_mid_gain_db',
+    '_eq_high': 'eq_high_gain_db',
+    '_chorus': 'chorus_mix',
+}
+_BYPASS_TOLERANCE = 1e-3
+
+# scratch 버퍼 정렬 단위 (캐시 라인 / AVX-512 레지스터 크기)
+_SCRATCH_ALIGN = 64
+# 필요한 크기가 현재 버퍼의 1/_SCRATCH_SHRINK보다 작으면 버퍼를 줄여 다시 할당함
+_SCRATCH_SHRINK = 4
+
+
+def _aligned_empty(size: int) -> np.ndarray:
+    """
+    시작 주소가 _SCRATCH_ALIGN 바이트에 정렬된 1차원 float32 배열 할당
+    
+    numpy 기본 할당은 16바이트 정렬만 보장하므로, 여유분을 더 잡은 바이트 버퍼에서
+    정렬된 위치부터 잘라 씀 (반환 배열의 base가 원래 버퍼를 붙잡고 있음)
+    
+    Parameters:
+        size (int): 원소 개수
+        
+    Returns:
+        np.ndarray: 정렬된 float32 배열 (초기화되지 않음)
+    """
+    itemsize = np.dtype(np.float32).itemsize
+    raw = np.empty(size * itemsize + _SCRATCH_ALIGN, dtype=np.uint8)
+    offset = -raw.ctypes.data % _SCRATCH_ALIGN
+    return raw[offset:offset + size * itemsize].view(np.float32)
 
 
 class SynthEffectsChain:
@@ -27,8 +112,16 @@ class SynthEffectsChain:
     
     Note: Noise Gate는 Compressor를 high ratio(10:1)로 설정하여 구현합니다.
           이는 threshold 이하의 신호를 효과적으로 감쇠시켜 노이즈를 제거합니다.
+          게인이 0dB(±1e-3)인 EQ 밴드와 mix가 0인 Chorus는 결과에 영향이 없으므로 보드에서 제외합니다.
     """
     
+    # 증강 루프에서 인스턴스를 많이 만들므로 __dict__ 없이 고정된 속성만 가짐
+    __slots__ = (
+        "params", "board", "_scratch",
+        "_gate", "_highpass", "_comp", "_eq_low", "_eq_mid", "_eq_high",
+        "_chorus", "_reverb", "_limiter",
+    )
+    
     def __init__(
         self,
         # Noise Gate parameters (Compressor를 high ratio로 사용)
@@ -162,13 +255,7 @@ class SynthEffectsChain:
             ...     reverb_wet_level=0.4
             ... )
         """
-        try:
-            from pedalboard import (
-                Pedalboard, Compressor, Gain, Chorus, Reverb, 
-                Limiter, HighpassFilter, LowShelfFilter, 
-                HighShelfFilter, PeakFilter
-            )
-        except ImportError:
+        if Pedalboard is None:
             raise ImportError(
                 "Pedalboard is not installed. Please install it with:\n"
                 "pip install pedalboard"
@@ -202,126 +289,235 @@ class SynthEffectsChain:
             'limiter_release_ms': limiter_release_ms,
         }
         
+        # 입력 변환용 scratch 버퍼 (process 호출 간에 재사용, 64바이트 정렬)
+        self._scratch: Optional[np.ndarray] = None
+        
         # Build effect chain
-        self.board = Pedalboard([
-            # 1. Noise Gate (Compressor를 high ratio로 사용하여 구현)
-            #    - threshold 이하의 신호를 10:1 비율로 감쇠
-            #    - 분리 후 남은 노이즈와 아티팩트를 효과적으로 제거
-            Compressor(
-                threshold_db=gate_threshold_db,
-                ratio=gate_ratio,
-                attack_ms=gate_attack_ms,
-                release_ms=gate_release_ms
-            ),
-            
-            # 2. High-pass Filter (저역 럼블 제거)
-            #    - 80Hz 이하의 불필요한 저음역 제거
-            #    - 분리 과정에서 생긴 저역 아티팩트 감소
-            HighpassFilter(cutoff_frequency_hz=highpass_cutoff_hz),
-            
-            # 3. Compressor (다이내믹 레인지 균일화)
-            #    - 피아노/신디 음량을 일정하게 유지
-            #    - 3:1 압축으로 자연스러운 다이내믹스 보존
-            Compressor(
-                threshold_db=comp_threshold_db,
-                ratio=comp_ratio,
-                attack_ms=comp_attack_ms,
-                release_ms=comp_release_ms
-            ),
-            
-            # 4. EQ - Low Shelf (200Hz 부근)
-            #    - 저음역 풀바디감 조절
-            LowShelfFilter(
-                cutoff_frequency_hz=200.0,
-                gain_db=eq_low_gain_db,
-                q=0.707
-            ),
-            
-            # 5. EQ - Mid Peak (1.5kHz - presence)
-            #    - 음의 존재감(presence) 강조
-            #    - 믹스에서 피아노/신디가 잘 들리도록
-            PeakFilter(
-                cutoff_frequency_hz=1500.0,
-                gain_db=eq_mid_gain_db,
-                q=1.0
-            ),
-            
-            # 6. EQ - High Shelf (8kHz - brightness)
-            #    - 밝기(brightness)와 명료도 향상
-            HighShelfFilter(
-                cutoff_frequency_hz=8000.0,
-                gain_db=eq_high_gain_db,
-                q=0.707
-            ),
-            
-            # 7. Chorus (스테레오 이미지 확장)
-            #    - 0.8Hz의 느린 LFO로 자연스러운 변조
-            #    - 30% wet mix로 미묘한 두께감 추가
-            Chorus(
-                rate_hz=chorus_rate_hz,
-                depth=chorus_depth,
-                centre_delay_ms=chorus_centre_delay_ms,
-                feedback=chorus_feedback,
-                mix=chorus_mix
-            ),
-            
-            # 8. Reverb (공간감)
-            #    - 작은 룸 사이즈로 자연스러운 앰비언스
-            #    - 피아노/신디에 공간감 부여
-            Reverb(
-                room_size=reverb_room_size,
-                damping=reverb_damping,
-                wet_level=reverb_wet_level,
-                dry_level=reverb_dry_level,
-                width=reverb_width
-            ),
-            
-            # 9. Limiter (출력 레벨 제한)
-            #    - -1dB에서 리미팅하여 클리핑 방지
-            Limiter(
-                threshold_db=limiter_threshold_db,
-                release_ms=limiter_release_ms
-            )
-        ])
+        # 각 플러그인은 속성으로 보관하여 update_params에서 값만 바꿀 수 있게 함
+        
+        # 1. Noise Gate (Compressor를 high ratio로 사용하여 구현)
+        #    - threshold 이하의 신호를 10:1 비율로 감쇠
+        #    - 분리 후 남은 노이즈와 아티팩트를 효과적으로 제거
+        self._gate = Compressor(
+            threshold_db=gate_threshold_db,
+            ratio=gate_ratio,
+            attack_ms=gate_attack_ms,
+            release_ms=gate_release_ms
+        )
+        
+        # 2. High-pass Filter (저역 럼블 제거)
+        #    - 80Hz 이하의 불필요한 저음역 제거
+        #    - 분리 과정에서 생긴 저역 아티팩트 감소
+        self._highpass = HighpassFilter(cutoff_frequency_hz=highpass_cutoff_hz)
+        
+        # 3. Compressor (다이내믹 레인지 균일화)
+        #    - 피아노/신디 음량을 일정하게 유지
+        #    - 3:1 압축으로 자연스러운 다이내믹스 보존
+        self._comp = Compressor(
+            threshold_db=comp_threshold_db,
+            ratio=comp_ratio,
+            attack_ms=comp_attack_ms,
+            release_ms=comp_release_ms
+        )
+        
+        # 4. EQ - Low Shelf (200Hz 부근)
+        #    - 저음역 풀바디감 조절
+        self._eq_low = LowShelfFilter(
+            cutoff_frequency_hz=200.0,
+            gain_db=eq_low_gain_db,
+            q=0.707
+        )
+        
+        # 5. EQ - Mid Peak (1.5kHz - presence)
+        #    - 음의 존재감(presence) 강조
+        #    - 믹스에서 피아노/신디가 잘 들리도록
+        self._eq_mid = PeakFilter(
+            cutoff_frequency_hz=1500.0,
+            gain_db=eq_mid_gain_db,
+            q=1.0
+        )
+        
+        # 6. EQ - High Shelf (8kHz - brightness)
+        #    - 밝기(brightness)와 명료도 향상
+        self._eq_high = HighShelfFilter(
+            cutoff_frequency_hz=8000.0,
+            gain_db=eq_high_gain_db,
+            q=0.707
+        )
+        
+        # 7. Chorus (스테레오 이미지 확장)
+        #    - 0.8Hz의 느린 LFO로 자연스러운 변조
+        #    - 30% wet mix로 미묘한 두께감 추가
+        self._chorus = Chorus(
+            rate_hz=chorus_rate_hz,
+            depth=chorus_depth,
+            centre_delay_ms=chorus_centre_delay_ms,
+            feedback=chorus_feedback,
+            mix=chorus_mix
+        )
+        
+        # 8. Reverb (공간감)
+        #    - 작은 룸 사이즈로 자연스러운 앰비언스
+        #    - 피아노/신디에 공간감 부여
+        self._reverb = Reverb(
+            room_size=reverb_room_size,
+            damping=reverb_damping,
+            wet_level=reverb_wet_level,
+            dry_level=reverb_dry_level,
+            width=reverb_width
+        )
+        
+        # 9. Limiter (출력 레벨 제한)
+        #    - -1dB에서 리미팅하여 클리핑 방지
+        self._limiter = Limiter(
+            threshold_db=limiter_threshold_db,
+            release_ms=limiter_release_ms
+        )
+        
+        self.board = Pedalboard(self._active_stages())
+    
+    def _active_stages(self) -> list:
+        """
+        효과가 없는 스테이지(_BYPASS_PARAMS 참고)를 뺀, 보드에 넣을 플러그인 리스트
+        """
+        return [
+            getattr(self, name) for name in _STAGES
+            if name not in _BYPASS_PARAMS
+            or abs(self.params[_BYPASS_PARAMS[name]]) > _BYPASS_TOLERANCE
+        ]
     
     def process(
         self, 
         audio: np.ndarray, 
         sample_rate: int,
-        reset: bool = True
+        reset: bool = True,
+        channels_first: Optional[bool] = None
     ) -> np.ndarray:
         """
         오디오에 이펙트 체인 적용
         
         Parameters:
-            audio (np.ndarray): 입력 오디오 [channels, samples] 또는 [samples]
+            audio (np.ndarray): 입력 오디오 [channels, samples], [samples, channels] 또는 [samples]
             sample_rate (int): 샘플레이트
             reset (bool): 각 처리마다 이펙트 상태를 리셋할지 여부
+            channels_first (bool, optional): 2차원 입력의 레이아웃. True면 [channels, samples],
+                False면 [samples, channels]. None이면 shape으로 추측함 (긴 축을 시간으로 간주하므로,
+                채널 수보다 짧은 클립은 잘못 판단함 - 레이아웃을 알면 명시할 것)
             
         Returns:
-            np.ndarray: 이펙트가 적용된 오디오
+            np.ndarray: 이펙트가 적용된 float32 오디오 (입력과 같은 레이아웃, [samples] 입력은 [1, samples])
+            
+        Note:
+            Pedalboard는 내부적으로 float32로만 처리하므로 float64 입력은 정밀도 이득 없이
+            변환 비용과 두 배의 메모리 대역폭만 듦. float64가 들어오면 경고를 내니 상위 코드에서
+            float32로 읽을 것 (load_audio()는 기본이 float32)
         """
+        if audio.dtype == np.float64:
+            warnings.warn(
+                "SynthEffectsChain.process() received float64 audio; it is processed as float32. "
+                "Load or convert audio as float32 upstream to avoid the extra conversion.",
+                RuntimeWarning,
+                stacklevel=2
+            )
+        
         # Ensure audio is in correct shape
         if audio.ndim == 1:
             audio = audio[np.newaxis, :]
         
-        # Transpose if needed: Pedalboard expects [channels, samples]
-        # but if shape is [samples, channels], transpose it
-        if audio.shape[0] > audio.shape[1] and audio.shape[0] > 100000:
+        # Pedalboard expects [channels, samples]: [samples, channels] 입력은 view로 전치
+        if channels_first is None:
+            channels_first = audio.shape[0] <= audio.shape[1]
+        if not channels_first:
             audio = audio.T
         
+        # 연속 float32 배열(보통의 스템)은 그대로 넘기고, 그 외(전치된 view, float64 등)는
+        # 재사용하는 scratch 버퍼로 한 번만 변환/복사 (Pedalboard 내부의 추가 변환 복사를 피함)
+        if audio.dtype != np.float32 or not audio.flags.c_contiguous:
+            # 평탄한 버퍼를 호출마다 reshape하므로 (C, T) view는 항상 연속임
+            # 짧은 클립이 이어지면 큰 버퍼를 계속 붙잡고 있지 않도록 줄여서 다시 할당
+            if (self._scratch is None or self._scratch.size < audio.size
+                    or self._scratch.size > audio.size * _SCRATCH_SHRINK):
+                self._scratch = _aligned_empty(audio.size)
+            scratch = self._scratch[:audio.size].reshape(audio.shape)
+            np.copyto(scratch, audio, casting='unsafe')
+            audio = scratch
+        
         # Apply effects
         effected = self.board(audio, sample_rate, reset=reset)
         
+        if not channels_first:
+            effected = effected.T
+        
         return effected
     
+    def process_batch(
+        self,
+        clips: Sequence[np.ndarray],
+        sample_rate: int
+    ) -> List[np.ndarray]:
+        """
+        여러 클립에 같은 이펙트 체인을 적용
+        
+        하나의 보드를 재사용하며 클립마다 상태를 리셋하므로, 각 클립의 결과는 process()를
+        따로 호출한 것과 같습니다. (클립들을 무음 구간과 함께 이어 붙여 한 번에 처리하는 방식은
+        코러스 LFO 위상과 컴프레서 상태가 클립 사이에 이어져 결과가 달라지고, 무음 구간 처리
+        비용이 Pedalboard 호출당 오버헤드보다 커서 사용하지 않음)
+        
+        Parameters:
+            clips (Sequence[np.ndarray]): 입력 클립 리스트 (각각 [channels, samples] 또는 [samples])
+            sample_rate (int): 샘플레이트
+            
+        Returns:
+            List[np.ndarray]: 입력 순서대로 이펙트가 적용된 클립
+        """
+        return [self.process(clip, sample_rate, reset=True) for clip in clips]
+    
+    def process_many(
+        self,
+        clips: Sequence[np.ndarray],
+        sample_rate: int,
+        num_workers: Optional[int] = None
+    ) -> List[np.ndarray]:
+        """
+        여러 클립을 스레드로 병렬 처리
+        
+        Pedalboard는 처리 중 GIL을 해제하므로 스레드 수(코어 수)에 비례해 빨라집니다.
+        플러그인 상태는 인스턴스별이라 동시에 실행할 수 없으므로, 워커 스레드마다 같은
+        파라미터로 만든 체인을 하나씩 사용합니다. 결과는 process_batch()와 같습니다.
+        
+        Parameters:
+            clips (Sequence[np.ndarray]): 입력 클립 리스트
+            sample_rate (int): 샘플레이트
+            num_workers (int, optional): 워커 스레드 수 (None이면 CPU 코어 수)
+            
+        Returns:
+            List[np.ndarray]: 입력 순서대로 이펙트가 적용된 클립
+        """
+        params = self.get_params()
+        local = threading.local()
+        
+        def run(clip: np.ndarray) -> np.ndarray:
+            chain = getattr(local, "chain", None)
+            if chain is None:
+                chain = local.chain = SynthEffectsChain(**params)
+            return chain.process(clip, sample_rate, reset=True)
+        
+        num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(clips)))
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            return list(executor.map(run, clips))
+    
     def get_params(self) -> Dict[str, float]:
         """현재 이펙트 파라미터 반환"""
         return self.params.copy()
     
     def update_params(self, **kwargs):
         """
-        이펙트 파라미터 업데이트 및 보드 재구성
+        이펙트 파라미터 업데이트
+        
+        보드를 다시 만들지 않고 바뀐 파라미터에 해당하는 플러그인의 값만 변경합니다.
+        (플러그인 객체와 보드는 그대로 재사용되며, 결과는 새 파라미터로 체인을 생성한 것과 같음)
+        EQ 게인이나 코러스 mix가 0이 되거나 0에서 바뀌어 건너뛸 스테이지가 달라지면
+        같은 플러그인 객체로 보드만 다시 구성합니다.
         
         Example:
             chain.update_params(
@@ -330,13 +526,27 @@ class SynthEffectsChain:
                 chorus_mix=0.4
             )
         """
-        # Update stored parameters
+        # Update stored parameters and the matching plugin property
         for key, value in kwargs.items():
             if key in self.params:
                 self.params[key] = value
+                plugin_name, prop = _PARAM_TARGETS[key]
+                setattr(getattr(self, plugin_name), prop, value)
         
-        # Rebuild the board with new parameters
-        self.__init__(**self.params)
+        if any(key in kwargs for key in _BYPASS_PARAMS.values()):
+            self.board = Pedalboard(self._active_stages())
+
+
+# 랜덤화되는 SynthEffectsChain 파라미터 -> RandomizedSynthEffects.ranges 키 (sample_params 열 순서)
+RANDOM_PARAMS = (
+    ('gate_threshold_db', 'gate_threshold'),
+    ('comp_threshold_db', 'comp_threshold'),
+    ('comp_ratio', 'comp_ratio'),
+    ('eq_mid_gain_db', 'eq_mid_gain'),
+    ('chorus_mix', 'chorus_mix'),
+    ('reverb_room_size', 'reverb_room_size'),
+    ('reverb_wet_level', 'reverb_wet'),
+)
 
 
 class RandomizedSynthEffects:
@@ -347,6 +557,8 @@ class RandomizedSynthEffects:
     다양한 음향 특성을 가진 데이터를 생성합니다.
     """
     
+    __slots__ = ("ranges", "_rng", "_chain")
+    
     def __init__(
         self,
         # Parameter ranges (min, max)
@@ -368,7 +580,8 @@ class RandomizedSynthEffects:
             chorus_mix_range: Chorus mix range (0.0-1.0)
             reverb_room_size_range: Reverb room size range (0.0-1.0)
             reverb_wet_range: Reverb wet level range (0.0-1.0)
-            seed: Random seed for reproducibility
+            seed: Random seed for reproducibility (인스턴스 전용 난수 생성기에만 적용되며
+                전역 random / np.random 상태는 변경하지 않음)
         """
         self.ranges = {
             'gate_threshold': gate_threshold_range,
@@ -380,9 +593,40 @@ class RandomizedSynthEffects:
             'reverb_wet': reverb_wet_range,
         }
         
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        self._rng = np.random.default_rng(seed)
+        
+        # process()에서 재사용하는 체인 (매번 새로 만들지 않고 랜덤 파라미터만 갱신)
+        self._chain: Optional[SynthEffectsChain] = None
+    
+    def sample_params(self, n: int) -> np.ndarray:
+        """
+        클립 n개 분량의 랜덤 파라미터를 한 번에 샘플링
+        
+        Parameters:
+            n (int): 샘플링할 파라미터 세트 수
+            
+        Returns:
+            np.ndarray: [n, 7] 배열 (열 순서는 RANDOM_PARAMS)
+        """
+        low = np.array([self.ranges[key][0] for _, key in RANDOM_PARAMS])
+        high = np.array([self.ranges[key][1] for _, key in RANDOM_PARAMS])
+        return self._rng.uniform(low, high, size=(n, len(RANDOM_PARAMS)))
+    
+    @staticmethod
+    def _row_to_params(row: np.ndarray) -> Dict[str, float]:
+        return {name: float(value) for (name, _), value in zip(RANDOM_PARAMS, row)}
+    
+    def _sample_params(self) -> Dict[str, float]:
+        """범위 내에서 랜덤 파라미터 7개를 샘플링"""
+        return self._row_to_params(self.sample_params(1)[0])
+    
+    def _apply(self, params: Dict[str, float], audio: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, Dict[str, float]]:
+        if self._chain is None:
+            self._chain = SynthEffectsChain(**params)
+        else:
+            self._chain.update_params(**params)
+        processed = self._chain.process(audio, sample_rate)
+        return processed, self._chain.get_params()
     
     def create_random_chain(self) -> SynthEffectsChain:
         """
@@ -391,17 +635,7 @@ class RandomizedSynthEffects:
         Returns:
             SynthEffectsChain: 랜덤화된 이펙트 체인
         """
-        params = {
-            'gate_threshold_db': random.uniform(*self.ranges['gate_threshold']),
-            'comp_threshold_db': random.uniform(*self.ranges['comp_threshold']),
-            'comp_ratio': random.uniform(*self.ranges['comp_ratio']),
-            'eq_mid_gain_db': random.uniform(*self.ranges['eq_mid_gain']),
-            'chorus_mix': random.uniform(*self.ranges['chorus_mix']),
-            'reverb_room_size': random.uniform(*self.ranges['reverb_room_size']),
-            'reverb_wet_level': random.uniform(*self.ranges['reverb_wet']),
-        }
-        
-        return SynthEffectsChain(**params)
+        return SynthEffectsChain(**self._sample_params())
     
     def process(
         self, 
@@ -418,9 +652,152 @@ class RandomizedSynthEffects:
         Returns:
             Tuple[np.ndarray, Dict]: (처리된 오디오, 사용된 파라미터)
         """
-        chain = self.create_random_chain()
-        processed = chain.process(audio, sample_rate)
-        return processed, chain.get_params()
+        return self._apply(self._sample_params(), audio, sample_rate)
+    
+    def process_batch(
+        self,
+        clips: Sequence[np.ndarray],
+        sample_rate: int
+    ) -> List[Tuple[np.ndarray, Dict[str, float]]]:
+        """
+        클립마다 다른 랜덤 파라미터로 여러 클립을 처리
+        
+        전체 클립의 파라미터를 sample_params()로 한 번에 샘플링한 뒤 행 단위로 적용합니다.
+        
+        Parameters:
+            clips (Sequence[np.ndarray]): 입력 클립 리스트
+            sample_rate (int): 샘플레이트
+            
+        Returns:
+            List[Tuple[np.ndarray, Dict]]: 입력 순서대로 (처리된 오디오, 사용된 파라미터)
+        """
+        rows = self.sample_params(len(clips))
+        return [
+            self._apply(self._row_to_params(row), clip, sample_rate)
+            for row, clip in zip(rows, clips)
+        ]
+    
+    def process_many(
+        self,
+        clips: Sequence[np.ndarray],
+        sample_rate: int,
+        num_workers: Optional[int] = None
+    ) -> List[Tuple[np.ndarray, Dict[str, float]]]:
+        """
+        클립마다 다른 랜덤 파라미터로 여러 클립을 스레드로 병렬 처리
+        
+        파라미터는 호출 스레드에서 미리 한 번에 샘플링하므로, 같은 seed면 결과는
+        process_batch()와 같습니다 (스레드 실행 순서와 무관). 워커 스레드마다 체인을
+        하나씩 두고 클립마다 파라미터만 갱신합니다.
+        
+        Parameters:
+            clips (Sequence[np.ndarray]): 입력 클립 리스트
+            sample_rate (int): 샘플레이트
+            num_workers (int, optional): 워커 스레드 수 (None이면 CPU 코어 수)
+            
+        Returns:
+            List[Tuple[np.ndarray, Dict]]: 입력 순서대로 (처리된 오디오, 사용된 파라미터)
+        """
+        def run(index: int, chain: SynthEffectsChain) -> Tuple[np.ndarray, Dict[str, float]]:
+            return chain.process(clips[index], sample_rate), chain.get_params()
+        
+        return self._map_threaded(len(clips), run, num_workers)
+    
+    def epoch(
+        self,
+        clips: Sequence[np.ndarray],
+        sample_rate: int,
+        num_workers: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, List[Dict[str, float]]]:
+        """
+        한 에폭 분량의 클립을 랜덤 파라미터로 병렬 처리하여 하나의 배열로 모음
+        
+        파라미터 샘플링(한 번의 draw)과 출력 배열 할당을 시작 시 한 번만 하고, 워커 스레드는
+        스레드별 체인의 파라미터만 갱신하며 처리 결과를 출력 배열의 자기 행에 바로 씁니다.
+        같은 seed면 각 클립의 결과와 파라미터는 process_batch()와 같습니다.
+        
+        Parameters:
+            clips (Sequence[np.ndarray]): 입력 클립 리스트 (각각 [channels, samples] 또는 [samples])
+            sample_rate (int): 샘플레이트
+            num_workers (int, optional): 워커 스레드 수 (None이면 CPU 코어 수)
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray, List[Dict]]:
+                - 처리된 오디오 [clips, channels, max_samples] float32
+                  (짧은 클립의 뒷부분과 채널 수가 적은 클립의 나머지 채널은 0)
+                - 클립별 샘플 길이 [clips]
+                - 클립별 사용된 파라미터
+        """
+        channels = max((clip.shape[0] if clip.ndim == 2 else 1 for clip in clips), default=1)
+        lengths = np.array([clip.shape[-1] for clip in clips], dtype=np.int64)
+        out = np.zeros((len(clips), channels, int(lengths.max(initial=0))), dtype=np.float32)
+        
+        def run(index: int, chain: SynthEffectsChain) -> Dict[str, float]:
+            effected = chain.process(clips[index], sample_rate, channels_first=True)
+            out[index, :effected.shape[0], :effected.shape[1]] = effected
+            return chain.get_params()
+        
+        params = self._map_threaded(len(clips), run, num_workers)
+        return out, lengths, params
+    
+    def _map_threaded(self, count: int, run, num_workers: Optional[int]) -> list:
+        """
+        count개의 클립 파라미터를 미리 샘플링한 뒤, 워커 스레드별 체인에 적용하여 run(index, chain)을 병렬 실행
+        
+        파라미터는 호출 스레드에서 한 번에 샘플링하므로 결과는 스레드 실행 순서와 무관하며,
+        반환 리스트는 index 순서를 따름
+        """
+        rows = self.sample_params(count)
+        local = threading.local()
+        
+        def task(index: int):
+            params = self._row_to_params(rows[index])
+            chain = getattr(local, "chain", None)
+            if chain is None:
+                chain = local.chain = SynthEffectsChain(**params)
+            else:
+                chain.update_params(**params)
+            return run(index, chain)
+        
+        num_workers = max(1, min(num_workers or os.cpu_count() or 1, count))
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            return list(executor.map(task, range(count)))
+
+
+# 프리셋 이름 -> SynthEffectsChain 파라미터 (기본값에서 바뀌는 것만)
+# 호출마다 다시 만들지 않도록 모듈 상수로 둠. 알 수 없는 프리셋은 기본값으로 처리함
+PRESETS: Dict[str, Dict[str, float]] = {
+    "default": {},
+
+    "bright": {
+        "eq_mid_gain_db": 3.0,
+        "eq_high_gain_db": 2.5,
+        "chorus_mix": 0.4,
+    },
+
+    "warm": {
+        "eq_low_gain_db": 1.5,
+        "eq_mid_gain_db": 1.0,
+        "eq_high_gain_db": -1.0,
+        "reverb_damping": 0.7,
+    },
+
+    "spacious": {
+        "chorus_mix": 0.5,
+        "chorus_depth": 0.4,
+        "reverb_room_size": 0.6,
+        "reverb_wet_level": 0.4,
+        "reverb_width": 1.0,
+    },
+
+    "tight": {
+        "comp_threshold_db": -25.0,
+        "comp_ratio": 5.0,
+        "reverb_room_size": 0.2,
+        "reverb_wet_level": 0.15,
+        "chorus_mix": 0.2,
+    }
+}
 
 
 def apply_synth_effects(
@@ -441,45 +818,8 @@ def apply_synth_effects(
     Returns:
         np.ndarray: 이펙트가 적용된 오디오
     """
-    # Preset configurations
-    presets = {
-        "default": {},
-        
-        "bright": {
-            "eq_mid_gain_db": 3.0,
-            "eq_high_gain_db": 2.5,
-            "chorus_mix": 0.4,
-        },
-        
-        "warm": {
-            "eq_low_gain_db": 1.5,
-            "eq_mid_gain_db": 1.0,
-            "eq_high_gain_db": -1.0,
-            "reverb_damping": 0.7,
-        },
-        
-        "spacious": {
-            "chorus_mix": 0.5,
-            "chorus_depth": 0.4,
-            "reverb_room_size": 0.6,
-            "reverb_wet_level": 0.4,
-            "reverb_width": 1.0,
-        },
-        
-        "tight": {
-            "comp_threshold_db": -25.0,
-            "comp_ratio": 5.0,
-            "reverb_room_size": 0.2,
-            "reverb_wet_level": 0.15,
-            "chorus_mix": 0.2,
-        }
-    }
-    
-    # Get preset params
-    params = presets.get(preset, {})
-    
-    # Override with custom params
-    params.update(custom_params)
+    # 프리셋 파라미터를 커스텀 파라미터로 덮어씀 (PRESETS의 dict는 변경하지 않음)
+    params = {**PRESETS.get(preset, {}), **custom_params}
     
     # Create and apply effects chain
     chain = SynthEffectsChain(**params)
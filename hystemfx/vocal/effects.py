@@ -179,23 +179,38 @@ class VocalRack:
     # =================================================================
     # 처리 메서드
     # =================================================================
-    def process(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    def process(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        reset: bool = True,
+        channels_first: Optional[bool] = None
+    ) -> np.ndarray:
+        # reset=False: 스트리밍 처리 시 이어지는 청크에서 이펙트 상태(잔향 등)를 유지함
+        # channels_first: 2차원 입력이 (C, T)이면 True, (T, C)이면 False. None이면 shape으로 추측하므로
+        #   채널 수보다 짧은 청크는 잘못 판단함 (스트리밍처럼 레이아웃을 아는 경우 명시할 것)
         if self.board is None:
             self._build_board()
 
-        input_audio = audio.copy()
+        # Pedalboard는 입력을 수정하지 않으므로 방어적 복사 없이 view로 다룸
+        input_audio = audio
 
         # (T,) -> (1, T)
         if input_audio.ndim == 1:
             input_audio = input_audio[np.newaxis, :]
 
+        if channels_first is None:
+            channels_first = input_audio.shape[0] <= input_audio.shape[1]
         transposed = False
         # (C, T)가 아니라 (T, C)이면 transpose
-        if input_audio.shape[0] > input_audio.shape[1]:
+        if not channels_first:
             input_audio = input_audio.T
             transposed = True
 
-        processed_audio = self.board(input_audio, sample_rate)
+        # 이미 float32 연속 배열이면 그대로 사용하고, 아니면 여기서 한 번만 변환
+        input_audio = np.ascontiguousarray(input_audio, dtype=np.float32)
+
+        processed_audio = self.board(input_audio, sample_rate, reset=reset)
 
         if transposed:
             processed_audio = processed_audio.T
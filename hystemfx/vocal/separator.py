@@ -21,7 +21,7 @@ class VocalSeparator(DemucsSeparator):
             model_name (str): 사용할 Demucs 모델 이름 (기본값: "htdemucs_6s")
             device (str): 실행 디바이스 ('cuda', 'cpu' 등)
         """
-        super().__init__(device=device)
+        super().__init__(device=device, model_name=model_name)
         self.target_stem = "vocals"
 
     def separate(
@@ -42,7 +42,11 @@ class VocalSeparator(DemucsSeparator):
             np.ndarray: 분리된 보컬 오디오 (return_all_stems=False)
             Dict[str, np.ndarray]: 모든 스템 (return_all_stems=True)
         """
-        stems = self.separate_memory(audio)
+        # 대상 스템(없으면 fallback용 'other')만 CPU로 복사하고 나머지는 버림
+        keep = None
+        if not return_all_stems:
+            keep = [self.target_stem if self.target_stem in self.model.sources else "other"]
+        stems = self.separate_memory(audio, keep=keep)
         
         if return_all_stems:
             return stems
@@ -0,0 +1,130 @@
+import unittest
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from hystemfx.core.io import load_audio, save_audio, AudioWriter
+
+
+def make_stereo(sr: int = 44100, duration_sec: float = 0.25) -> np.ndarray:
+    """
+    채널마다 다른 사인파로 만든 (C, T) float32 스테레오 신호
+    """
+    t = np.arange(int(sr * duration_sec)) / sr
+    left = 0.5 * np.sin(2 * np.pi * 440 * t)
+    right = 0.25 * np.sin(2 * np.pi * 660 * t)
+    return np.stack([left, right]).astype(np.float32)
+
+
+class TestPcm16Quantization(unittest.TestCase):
+    def test_save_audio_matches_libsndfile_pcm16(self):
+        # NumPy 양자화 경로가 libsndfile의 float -> PCM_16 변환과 비트 단위로 같아야 함
+        # (0 근처 아주 작은 음수, 반올림 경계, 범위 밖 값 포함 / float32, float64 입력)
+        rng = np.random.default_rng(0)
+        n = 20000
+        columns = [
+            rng.uniform(-1.3, 1.3, n),
+            rng.standard_normal(n) * 1e-9,
+            (rng.integers(-40000, 40000, n) * 65536 - rng.uniform(0, 1, n)) / 2 ** 31,
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = Path(tmpdir)
+            for dtype in (np.float32, np.float64):
+                audio = np.stack([np.concatenate(columns), -np.concatenate(columns)]).astype(dtype)
+                ours = tmpdir / f"ours_{dtype.__name__}.wav"
+                reference = tmpdir / f"reference_{dtype.__name__}.wav"
+
+                save_audio(audio, ours, sr=44100)
+                sf.write(str(reference), audio.T, 44100, subtype="PCM_16")
+
+                self.assertEqual(ours.read_bytes(), reference.read_bytes(), dtype.__name__)
+
+
+class TestAudioRoundTrip(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stereo_round_trip_keeps_channels_first_layout(self):
+        audio = make_stereo()
+        path = self.root / "stereo.wav"
+
+        save_audio(audio, path, sr=44100, subtype="FLOAT")
+        loaded, sr = load_audio(path)
+
+        self.assertEqual(sr, 44100)
+        self.assertEqual(loaded.shape, audio.shape)
+        self.assertEqual(loaded.dtype, np.float32)
+        self.assertTrue(loaded.flags["C_CONTIGUOUS"])
+        np.testing.assert_array_equal(loaded, audio)
+
+    def test_file_on_disk_is_interleaved_like_soundfile(self):
+        # 디스크 포맷은 그대로: (C, T) 저장 결과는 soundfile에 (T, C)를 쓴 파일과 같아야 함
+        audio = make_stereo()
+        ours = self.root / "ours.wav"
+        reference = self.root / "reference.wav"
+
+        save_audio(audio, ours, sr=44100)
+        sf.write(str(reference), audio.T, 44100, subtype="PCM_16")
+
+        self.assertEqual(ours.read_bytes(), reference.read_bytes())
+
+        loaded, _ = load_audio(reference)
+        expected, _ = sf.read(str(reference), dtype="float32", always_2d=True)
+        np.testing.assert_array_equal(loaded, expected.T)
+
+    def test_mono_save_and_downmix(self):
+        mono = make_stereo()[0]
+        mono_path = self.root / "mono.wav"
+
+        save_audio(mono, mono_path, sr=44100, subtype="FLOAT")
+        self.assertEqual(sf.info(str(mono_path)).channels, 1)
+
+        loaded, _ = load_audio(mono_path)
+        self.assertEqual(loaded.shape, (1, mono.shape[0]))
+        np.testing.assert_array_equal(loaded[0], mono)
+
+        # 스테레오 파일을 mono=True로 읽으면 채널 평균의 1D 배열
+        stereo = make_stereo()
+        stereo_path = self.root / "stereo.wav"
+        save_audio(stereo, stereo_path, sr=44100, subtype="FLOAT")
+        downmixed, _ = load_audio(stereo_path, mono=True)
+        self.assertEqual(downmixed.shape, (stereo.shape[1],))
+        self.assertEqual(downmixed.dtype, np.float32)
+        np.testing.assert_allclose(downmixed, stereo.mean(axis=0), atol=1e-7)
+
+    def test_resample_on_load(self):
+        audio = make_stereo(sr=22050)
+        path = self.root / "low_sr.wav"
+        save_audio(audio, path, sr=22050, subtype="FLOAT")
+
+        resampled, sr = load_audio(path, sr=44100)
+        self.assertEqual(sr, 44100)
+        self.assertEqual(resampled.shape, (2, audio.shape[1] * 2))
+        self.assertEqual(resampled.dtype, np.float32)
+
+        native, sr = load_audio(path, sr=None)
+        self.assertEqual(sr, 22050)
+        self.assertEqual(native.shape, audio.shape)
+
+    def test_audio_writer_matches_save_audio(self):
+        # 청크 단위로 나눠 써도 한 번에 저장한 파일과 같아야 함
+        audio = make_stereo()
+        whole = self.root / "whole.wav"
+        chunked = self.root / "chunked.wav"
+
+        save_audio(audio, whole, sr=44100)
+        with AudioWriter(chunked, sr=44100, channels=2) as writer:
+            for start in range(0, audio.shape[1], 1000):
+                writer.write(audio[:, start:start + 1000])
+
+        self.assertEqual(chunked.read_bytes(), whole.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
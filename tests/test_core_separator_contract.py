@@ -5,8 +5,11 @@ from pathlib import Path
 
 import numpy as np
 import soundfile as sf
+import torch
+from demucs.apply import BagOfModels, apply_model
+from demucs.htdemucs import HTDemucs
 
-from hystemfx.core.separator import DemucsSeparator
+from hystemfx.core.separator import DemucsSeparator, _apply_model_batched, _load_model
 
 
 def create_short_dummy_wav(path: str, sr: int = 44100, duration_sec: float = 0.5):
@@ -27,6 +30,16 @@ class TestCoreSeparatorContract(unittest.TestCase):
         # 테스트 전체에서 Demucs 한 번만 로드 (느려서)
         cls.separator = DemucsSeparator(device="cpu")
 
+    def test_compiled_model_is_not_shared_with_plain_separators(self):
+        # 컴파일하지 않는 Separator끼리는 모델을 공유하고,
+        # forward를 교체하는 compile 경로는 별도 사본을 받아야 함
+        other = DemucsSeparator(device="cpu")
+        self.assertIs(other.model, self.separator.model)
+
+        compiled = _load_model(self.separator.model_name, "cpu", compiled=True)
+        self.assertIsNot(compiled, self.separator.model)
+        self.assertIs(_load_model(self.separator.model_name, "cpu", compiled=True), compiled)
+
     def test_separate_file_core_api_contract(self):
         # ---------------------------
         # 1. 짧은 테스트 파일 생성
@@ -87,5 +100,43 @@ class TestCoreSeparatorContract(unittest.TestCase):
         )
 
 
+def make_tiny_htdemucs(seed: int) -> HTDemucs:
+    """
+    테스트용 작은 랜덤 초기화 HTDemucs (8kHz, 1초 segment)
+    """
+    torch.manual_seed(seed)
+    model = HTDemucs(
+        sources=["drums", "bass", "other", "vocals"], samplerate=8000, segment=1,
+        channels=8, depth=2, t_layers=1, t_hidden_scale=1.0, t_heads=1, bottom_channels=0, nfft=512,
+    )
+    return model.eval()
+
+
+class TestApplyModelBatched(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        # stride(0.75초)의 배수가 아닌 길이 -> 마지막 segment가 패딩됨
+        self.mix = torch.randn(2, 2, 8000 * 3 + 123)
+
+    def assert_matches_apply_model(self, model):
+        with torch.inference_mode():
+            expected = apply_model(model, self.mix, split=True, shifts=0, overlap=0.25, progress=False)
+            for segment_batch in (1, 3):
+                with self.subTest(segment_batch=segment_batch):
+                    out = _apply_model_batched(model, self.mix, None, 0.25, segment_batch)
+                    self.assertEqual(out.shape, expected.shape)
+                    self.assertTrue(torch.allclose(out, expected, atol=1e-6))
+
+    def test_single_model_matches_apply_model(self):
+        self.assert_matches_apply_model(make_tiny_htdemucs(0))
+
+    def test_bag_of_models_matches_apply_model(self):
+        bag = BagOfModels(
+            [make_tiny_htdemucs(0), make_tiny_htdemucs(1)],
+            weights=[[1.0, 2.0, 1.0, 0.5], [2.0, 1.0, 1.0, 1.5]],
+        )
+        self.assert_matches_apply_model(bag)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -58,6 +58,24 @@ class TestDeterminismVocal(unittest.TestCase):
             "다른 seed인데 VocalRack 출력이 지나치게 동일합니다."
         )
 
+    def test_vocal_chunked_without_reset_matches_whole(self):
+        # run_pipeline(segment=...) 스트리밍 처리: reset=False로 이어서 처리하면 한 번에 처리한 결과와 같아야 함
+        audio, sr = make_dummy_audio(duration=1.0)
+
+        whole = VocalRack(preset="roomy", verbose=False).process(audio, sr)
+
+        rack = VocalRack(preset="roomy", verbose=False)
+        half = audio.shape[1] // 2
+        chunked = np.concatenate([
+            rack.process(audio[:, :half], sr),
+            rack.process(audio[:, half:], sr, reset=False),
+        ], axis=1)
+
+        self.assertTrue(
+            np.allclose(whole, chunked, atol=1e-6),
+            "reset=False로 이어서 처리한 VocalRack 출력이 전체 처리 결과와 다릅니다."
+        )
+
 
 class TestDeterminismBass(unittest.TestCase):
     def test_bass_same_seed_gives_same_output(self):
@@ -77,6 +95,25 @@ class TestDeterminismBass(unittest.TestCase):
             "같은 seed인데 BassRack 출력이 다릅니다."
         )
 
+    def test_bass_chunked_with_short_tail_matches_whole(self):
+        # 스트리밍 마지막 청크가 채널 수보다 짧아도 channels_first=True면 전치되지 않아야 함
+        audio, sr = make_dummy_audio(duration=1.0)
+
+        whole = BassRack(preset="default", verbose=False).process(audio, sr)
+
+        rack = BassRack(preset="default", verbose=False)
+        split = audio.shape[1] - 1
+        chunked = np.concatenate([
+            rack.process(audio[:, :split], sr, channels_first=True),
+            rack.process(audio[:, split:], sr, reset=False, channels_first=True),
+        ], axis=1)
+
+        self.assertEqual(chunked.shape, whole.shape)
+        self.assertTrue(
+            np.allclose(whole, chunked, atol=1e-6),
+            "짧은 마지막 청크를 이어서 처리한 BassRack 출력이 전체 처리 결과와 다릅니다."
+        )
+
 
         # 필요하면 여기서도 다른 seed → 다른 출력 테스트 추가 가능
 
@@ -61,6 +61,18 @@ class TestGuitarEffectsChain(unittest.TestCase):
         # 다시 (T, C) 형태로 나와야 함
         self.assertEqual(out.shape, tc_audio.shape)
 
+    def test_channels_first_overrides_shape_guess(self):
+        # 채널 수보다 짧은 (C, T) 클립은 shape만으로는 (T, C)로 오인됨
+        short = self.audio[:, :1]
+        chain = GuitarEffectsChain(preset="clean")
+
+        out = chain.process(short, self.sr, channels_first=True)
+        self.assertEqual(out.shape, short.shape)
+
+        # 명시적인 (T, C) 입력은 (T, C)로 돌려줌
+        out_tc = chain.process(self.audio.T, self.sr, channels_first=False)
+        self.assertEqual(out_tc.shape, self.audio.T.shape)
+
     # ---------------------------------------------------------
     # 3) get_settings 동작 확인
     # ---------------------------------------------------------
@@ -91,5 +103,22 @@ class TestGuitarEffectsChain(unittest.TestCase):
         self.assertEqual(out.shape, self.audio.shape)
 
 
+    # ---------------------------------------------------------
+    # 5) 체인마다 별도 보드 → 다른 체인이 스트리밍 상태를 건드리지 않음
+    # ---------------------------------------------------------
+    def test_chains_do_not_share_board_by_default(self):
+        a = GuitarEffectsChain(preset="clean")
+        b = GuitarEffectsChain(preset="clean")
+        self.assertIsNot(a.board, b.board)
+
+        half = self.sr // 2
+        whole = GuitarEffectsChain(preset="clean").process(self.audio, self.sr)
+        first = a.process(self.audio[:, :half], self.sr, reset=True)
+        b.process(self.audio, self.sr)
+        second = a.process(self.audio[:, half:], self.sr, reset=False)
+
+        self.assertTrue(np.array_equal(np.concatenate([first, second], axis=1), whole))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,135 @@
+import os
+import unittest
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from hystemfx.pipeline import (
+    SEPARATION_META_NAME,
+    _separation_settings,
+    _save_separation_meta,
+    _load_cached_stems,
+    _batch_output_names,
+    collect_inputs,
+)
+
+
+def write_dummy_stems(separated_dir: Path, sr: int = 44100, fmt: str = "wav"):
+    """
+    분리 결과처럼 보이는 짧은 스테레오 스템 파일 생성 (T, C로 저장)
+    """
+    rng = np.random.default_rng(0)
+    for name in ("vocals", "bass"):
+        audio = rng.uniform(-0.5, 0.5, size=(sr // 10, 2)).astype(np.float32)
+        sf.write(str(separated_dir / f"{name}.{fmt}"), audio, sr)
+
+
+class TestSeparationMeta(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.input_path = root / "mix.wav"
+        sf.write(str(self.input_path), np.zeros((100, 2), dtype=np.float32), 44100)
+        self.separated_dir = root / "separated"
+        self.separated_dir.mkdir()
+        self.settings = _separation_settings("cpu", True, None)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def save(self, sr=44100, fmt="wav", settings=None):
+        write_dummy_stems(self.separated_dir, sr=sr, fmt=fmt)
+        _save_separation_meta(
+            self.input_path, self.separated_dir, sr, ["vocals", "bass"], fmt,
+            self.settings if settings is None else settings
+        )
+
+    def test_round_trip_uses_recorded_sample_rate(self):
+        self.save(sr=32000)
+
+        cached = _load_cached_stems(self.input_path, self.separated_dir, "wav", self.settings)
+
+        self.assertIsNotNone(cached)
+        stems, sr = cached
+        self.assertEqual(sr, 32000)
+        self.assertEqual(sorted(stems), ["bass", "vocals"])
+        self.assertEqual(stems["vocals"].shape, (2, 3200))
+        self.assertEqual(stems["vocals"].dtype, np.float32)
+
+    def test_changed_settings_or_format_invalidate(self):
+        self.save()
+
+        other_segment = _separation_settings("cpu", True, 10.0)
+        self.assertIsNone(_load_cached_stems(self.input_path, self.separated_dir, "wav", other_segment))
+        self.assertIsNone(_load_cached_stems(self.input_path, self.separated_dir, "flac", self.settings))
+
+        # CPU는 항상 FP32이므로 use_autocast만 바뀐 경우는 재사용함
+        cpu_fp32 = _separation_settings("cpu", False, None)
+        self.assertIsNotNone(_load_cached_stems(self.input_path, self.separated_dir, "wav", cpu_fp32))
+
+    def test_changed_input_or_missing_stem_invalidate(self):
+        self.save()
+
+        (self.separated_dir / "bass.wav").unlink()
+        self.assertIsNone(_load_cached_stems(self.input_path, self.separated_dir, "wav", self.settings))
+
+        self.save()
+        sf.write(str(self.input_path), np.zeros((200, 2), dtype=np.float32), 44100)
+        self.assertIsNone(_load_cached_stems(self.input_path, self.separated_dir, "wav", self.settings))
+
+    def test_lossy_format_is_never_reused(self):
+        self.save(fmt="ogg")
+
+        self.assertTrue((self.separated_dir / SEPARATION_META_NAME).exists())
+        self.assertIsNone(_load_cached_stems(self.input_path, self.separated_dir, "ogg", self.settings))
+
+
+class TestBatchInputs(unittest.TestCase):
+    def test_output_names_keep_plain_stems(self):
+        self.assertEqual(_batch_output_names(["songs/a.wav", "songs/b.mp3"]), ["a", "b"])
+
+    def test_output_names_for_same_file_name_across_directories(self):
+        names = _batch_output_names(["x/a.wav", "y/a.wav", "z/a.mp3", "c.wav"])
+
+        self.assertEqual(names, ["a_wav", "a_wav_2", "a_mp3", "c"])
+
+    def test_output_names_never_collide_with_existing_names(self):
+        # 확장자를 붙인 이름이 다른 파일의 이름과 겹쳐도 모두 서로 달라야 함
+        paths = ["a_wav.flac", "x/a.WAV", "y/a.wav"]
+        names = _batch_output_names(paths)
+
+        self.assertEqual(names, ["a_wav", "a_wav_2", "a_wav_3"])
+        self.assertEqual(len(set(names)), len(paths))
+
+    def test_collect_inputs_directory_and_glob(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for name in ("b.wav", "a.FLAC", "c.mp3", "notes.txt"):
+                (root / name).touch()
+            (root / "nested.wav").mkdir()
+
+            # 디렉토리: 안의 오디오 파일만 (대소문자 무시, 하위 디렉토리 제외), 정렬
+            self.assertEqual(
+                collect_inputs(root), [root / "a.FLAC", root / "b.wav", root / "c.mp3"]
+            )
+
+            # 절대 경로 glob: 파일만
+            self.assertEqual(collect_inputs(str(root / "*.wav")), [root / "b.wav"])
+
+            # 상대 경로 glob
+            cwd = os.getcwd()
+            os.chdir(root)
+            try:
+                self.assertEqual(collect_inputs("*.mp3"), [Path("c.mp3")])
+            finally:
+                os.chdir(cwd)
+
+            # 일치하는 파일이 없으면 빈 리스트, 일반 경로는 그대로
+            self.assertEqual(collect_inputs(str(root / "*.ogg")), [])
+            self.assertEqual(collect_inputs(root / "b.wav"), [root / "b.wav"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,13 @@
 import unittest
 from pathlib import Path
 import numpy as np
+from pedalboard import Pedalboard
 
 from hystemfx.synth.effects import (
     SynthEffectsChain,
     RandomizedSynthEffects,
     apply_synth_effects,
+    RANDOM_PARAMS,
 )
 
 
@@ -60,6 +62,104 @@ class TestSynthEffectsChainBasic(unittest.TestCase):
         self.assertEqual(out.ndim, 2)
         self.assertTrue(np.isfinite(out).all())
 
+    def test_TxC_input_keeps_layout_and_matches_CxT(self):
+        # 긴 (T, C) 입력도 (T, C)로 돌려주고, 결과는 (C, T)로 처리한 것과 같아야 함
+        audio, sr = make_dummy_audio(channels=2, duration=3.0)  # T > 100000
+        chain = SynthEffectsChain()
+
+        out_ct = chain.process(audio, sr)
+        out_tc = chain.process(audio.T, sr)
+        self.assertEqual(out_tc.shape, audio.T.shape)
+        self.assertTrue(np.allclose(out_tc.T, out_ct, atol=1e-6))
+
+        # 채널 수보다 짧은 클립은 channels_first로 레이아웃을 명시
+        short = audio[:, :1]
+        self.assertEqual(chain.process(short, sr, channels_first=True).shape, short.shape)
+
+    def test_process_batch_matches_per_clip_process(self):
+        # 배치 처리 결과는 클립마다 process()를 따로 호출한 결과와 같아야 함
+        stereo, sr = make_dummy_audio(channels=2, duration=0.3)
+        mono, _ = make_dummy_audio(channels=1, duration=0.2)
+        clips = [stereo, mono[0], stereo[:, ::-1].copy()]
+        chain = SynthEffectsChain()
+
+        outs = chain.process_batch(clips, sr)
+
+        self.assertEqual(len(outs), len(clips))
+        for clip, out in zip(clips, outs):
+            expected = SynthEffectsChain().process(clip, sr)
+            self.assertEqual(out.shape, expected.shape)
+            self.assertTrue(np.allclose(out, expected, atol=1e-6))
+
+    def test_zero_gain_stages_are_bypassed_without_changing_output(self):
+        # 0dB EQ 밴드와 mix 0 코러스는 보드에서 빠지지만 결과는 같아야 함
+        audio, sr = make_dummy_audio(duration=0.3)
+        audio = audio.astype(np.float32)
+        chain = SynthEffectsChain(eq_mid_gain_db=0.0, chorus_mix=0.0)
+        full = Pedalboard([getattr(chain, name) for name in (
+            "_gate", "_highpass", "_comp", "_eq_low", "_eq_mid", "_eq_high",
+            "_chorus", "_reverb", "_limiter",
+        )])
+
+        self.assertEqual(len(chain.board), 6)
+        self.assertTrue(np.array_equal(chain.process(audio, sr), full(audio, sr)))
+
+        chain.update_params(eq_mid_gain_db=2.0, chorus_mix=0.3)
+        self.assertEqual(len(chain.board), 8)
+
+    def test_process_many_matches_process_batch(self):
+        # 스레드 병렬 처리 결과는 순서와 값 모두 순차 배치 처리와 같아야 함
+        audio, sr = make_dummy_audio(duration=0.2)
+        clips = [audio * scale for scale in (1.0, 0.5, 0.25, 0.1)]
+        chain = SynthEffectsChain()
+
+        expected = chain.process_batch(clips, sr)
+        outs = chain.process_many(clips, sr, num_workers=3)
+
+        self.assertEqual(len(outs), len(clips))
+        for out, exp in zip(outs, expected):
+            self.assertTrue(np.array_equal(out, exp))
+
+
+class TestRandomizedSynthEffects(unittest.TestCase):
+    def test_same_seed_gives_same_params_and_batch_matches_sequential(self):
+        audio, sr = make_dummy_audio(duration=0.3)
+
+        sequential = RandomizedSynthEffects(seed=7)
+        batched = RandomizedSynthEffects(seed=7)
+
+        outs = [sequential.process(audio, sr) for _ in range(3)]
+        batch_outs = batched.process_batch([audio] * 3, sr)
+
+        for (out, params), (batch_out, batch_params) in zip(outs, batch_outs):
+            self.assertEqual(params, batch_params)
+            self.assertTrue(np.allclose(out, batch_out, atol=1e-6))
+
+    def test_epoch_stacks_batch_results_with_padding(self):
+        audio, sr = make_dummy_audio(duration=0.3)
+        clips = [audio, audio[:, : audio.shape[1] // 2]]
+
+        expected = RandomizedSynthEffects(seed=5).process_batch(clips, sr)
+        out, lengths, params = RandomizedSynthEffects(seed=5).epoch(clips, sr, num_workers=2)
+
+        self.assertEqual(out.shape, (2, audio.shape[0], audio.shape[1]))
+        self.assertEqual(list(lengths), [clip.shape[1] for clip in clips])
+        for i, (exp_out, exp_params) in enumerate(expected):
+            self.assertEqual(params[i], exp_params)
+            self.assertTrue(np.array_equal(out[i, :, : lengths[i]], exp_out))
+            self.assertFalse(out[i, :, lengths[i]:].any())
+
+    def test_sample_params_within_ranges(self):
+        randomizer = RandomizedSynthEffects(seed=0)
+        rows = randomizer.sample_params(100)
+
+        self.assertEqual(rows.shape, (100, len(RANDOM_PARAMS)))
+        # 각 열은 RANDOM_PARAMS 순서대로 해당 ranges 범위 안에 있어야 함
+        for column, (param, range_key) in enumerate(RANDOM_PARAMS):
+            with self.subTest(param=param):
+                low, high = randomizer.ranges[range_key]
+                self.assertTrue(((rows[:, column] >= low) & (rows[:, column] <= high)).all())
+
 
 class TestSynthEffectsPresets(unittest.TestCase):
     def test_apply_synth_effects_all_presets(self):